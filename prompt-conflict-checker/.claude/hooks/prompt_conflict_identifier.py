@@ -6,41 +6,101 @@ When a prompt exceeds the token threshold, this hook blocks submission,
 saves the prompt to /tmp/prompt-conflicts/, and instructs the user to
 submit a short slash command instead that will ask the agent to analyze
 the saved prompt for conflicts.
+
+With PROMPT_CONFLICT_DAEMON=1 the hook forwards its input to a long-lived
+local daemon (started on demand) so the tokenizer is loaded once rather
+than on every prompt; it falls back to in-process handling when the daemon
+is unreachable.
 """
 
 from __future__ import annotations
 
-import hashlib
+import functools
 import json
 import os
-import subprocess
 import sys
-import time
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, NoReturn
+from typing import Any, Callable, Mapping, NamedTuple, NoReturn, Sized
 
 # ============================================================================
-# Token Counting (tiktoken-based with fallback)
+# Token Counting (tokenizers -> tiktoken -> char estimate)
 # ============================================================================
 
-try:
-    import tiktoken
-    _ENC = tiktoken.get_encoding("o200k_base")
-    _encode = _ENC.encode_ordinary
-    TIKTOKEN_AVAILABLE = True
-except ImportError:
-    TIKTOKEN_AVAILABLE = False
-    _encode = None
+# Long prompts are split into chunks of this many chars and counted in
+# parallel by tiktoken's Rust threadpool.
+_BATCH_CHUNK_CHARS = 64 * 1024
+
+# _encode returns something Sized; only its length is ever read.
+# Loaded on first count_tokens call: short prompts never pay the import.
+_encode: Callable[[str], Sized] | None = None
+_encode_batch: Callable[[list[str]], list[Sized]] | None = None
+TOKENIZER_BACKEND: str | None = None  # None until loaded
+
+
+def load_tokenizer() -> None:
+    """Bind the fastest available backend to _encode (idempotent)."""
+    global _encode, _encode_batch, TOKENIZER_BACKEND
+    if TOKENIZER_BACKEND is not None:
+        return
+    TOKENIZER_BACKEND = "estimate"
+
+    # HF `tokenizers` is the fastest o200k_base backend, but needs a local
+    # tokenizer.json (e.g. Xenova/gpt-4o); never fetch from the network in a hook.
+    tokenizer_json = os.environ.get("PROMPT_CONFLICT_TOKENIZER_JSON", "")
+    if tokenizer_json:
+        try:
+            from tokenizers import Tokenizer
+            tok = Tokenizer.from_file(tokenizer_json)
+            # Encoding.__len__ reads the length in Rust without copying ids out
+            _encode = lambda text: tok.encode(text, add_special_tokens=False)  # noqa: E731
+            TOKENIZER_BACKEND = "tokenizers"
+            return
+        except Exception:
+            _encode = None
+
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding("o200k_base")
+    except Exception:  # not installed, or encoding file unavailable offline
+        return
+    _encode = enc.encode_ordinary
+    _encode_batch = lambda chunks: enc.encode_ordinary_batch(  # noqa: E731
+        chunks, num_threads=os.cpu_count() or 1
+    )
+    TOKENIZER_BACKEND = "tiktoken"
+
+
+def _split_chunks(text: str, size: int) -> list[str]:
+    """Split text into ~size-char chunks, preferring line boundaries."""
+    chunks: list[str] = []
+    start, n = 0, len(text)
+    while start < n:
+        end = min(start + size, n)
+        if end < n:
+            cut = text.rfind("\n", start, end)
+            if cut > start:
+                end = cut + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
 
 
 def count_tokens(text: str) -> int:
     """Count tokens using o200k_base encoding, fallback to char estimate."""
-    if TIKTOKEN_AVAILABLE and _encode:
+    load_tokenizer()
+    if _encode:
+        if _encode_batch is not None and len(text) > _BATCH_CHUNK_CHARS:
+            # Chunk boundaries may shift a token or two; fine for a threshold.
+            return sum(map(len, _encode_batch(_split_chunks(text, _BATCH_CHUNK_CHARS))))
         return len(_encode(text))
     return len(text) >> 2  # ~4 chars per token estimate
 
 
+def max_tokens(text: str) -> int:
+    """Cheap upper bound on the token count: every token spans >= 1 UTF-8 byte."""
+    return len(text) if text.isascii() else len(text.encode())
+
+
 # ============================================================================
 # Platform Detection (cached at module load)
 # ============================================================================
@@ -49,6 +109,23 @@ _PLATFORM = sys.platform
 _IS_WSL = "microsoft" in os.uname().release.lower() if hasattr(os, "uname") else False
 
 
+# ============================================================================
+# JSON Backend (orjson -> stdlib json)
+# ============================================================================
+
+# orjson parses several times faster and serializes straight to compact bytes.
+# Both backends raise ValueError subclasses on bad input, so one handler fits.
+try:
+    import orjson
+    _json_loads: Callable[[str | bytes], Any] = orjson.loads
+    _json_dumps: Callable[[Any], bytes] = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
 # ============================================================================
 # Environment Helpers
 # ============================================================================
@@ -56,15 +133,13 @@ _IS_WSL = "microsoft" in os.uname().release.lower() if hasattr(os, "uname") else
 _TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
 
 
-def env_bool(key: str, default: bool = False) -> bool:
-    """Get boolean env var."""
-    val = os.environ.get(key, "").lower()
-    return val in _TRUE_VALUES if val else default
+def parse_bool(raw: str | None, default: bool = False) -> bool:
+    """Parse a boolean env value; unset or empty means default."""
+    return raw.lower() in _TRUE_VALUES if raw else default
 
 
-def env_int(key: str, default: int) -> int:
-    """Get integer env var with default."""
-    raw = os.environ.get(key)
+def parse_int(raw: str | None, default: int) -> int:
+    """Parse an integer env value, falling back to default."""
     if raw is None:
         return default
     try:
@@ -73,17 +148,16 @@ def env_int(key: str, default: int) -> int:
         return default
 
 
-def env_path(key: str, default: str) -> Path:
-    """Get path env var with default."""
-    return Path(os.environ.get(key, default))
+def env_bool(key: str, default: bool = False, env: Mapping[str, str] = os.environ) -> bool:
+    """Get boolean env var."""
+    return parse_bool(env.get(key), default)
 
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
-@dataclass(slots=True, frozen=True)
-class Config:
+class Config(NamedTuple):
     """Runtime configuration loaded from environment variables."""
 
     token_threshold: int
@@ -92,18 +166,44 @@ class Config:
     tmp_dir: Path
     skip_prefix: str
     skip_prefix_lower: str
+    interactive: bool
+
+
+# Hook stdio is always piped, so a user-facing terminal/desktop is inferred
+# from the env vars terminals and display servers set.
+_INTERACTIVE_ENV_KEYS = ("TERM_PROGRAM", "DISPLAY", "WAYLAND_DISPLAY", "WT_SESSION")
 
+# Env vars read by load_config; the daemon client forwards these per request
+_CONFIG_ENV_KEYS = (
+    "LONG_PROMPT_THRESHOLD",
+    "PROMPT_CONFLICT_ALWAYS_ON",
+    "PROMPT_CONFLICT_ALLOW_OVERRIDE",
+    "PROMPT_CONFLICT_TMP_DIR",
+    "CI",
+    *_INTERACTIVE_ENV_KEYS,
+)
 
-def load_config() -> Config:
+
+def load_config(env: Mapping[str, str] = os.environ) -> Config:
     """Load configuration from environment with safe defaults."""
+    # One pass over the env; everything else works on the snapshot tuple
+    get = env.get
+    return _config_for(tuple([get(k) for k in _CONFIG_ENV_KEYS]))
+
+
+@functools.lru_cache(maxsize=16)
+def _config_for(values: tuple[str | None, ...]) -> Config:
+    """Build Config from the _CONFIG_ENV_KEYS values; memoized per distinct env."""
+    threshold, always_on, allow_override, tmp_dir, ci, *display = values
     skip_prefix = "# skip-conflict-check"
     return Config(
-        token_threshold=env_int("LONG_PROMPT_THRESHOLD", 1800),
-        always_on=env_bool("PROMPT_CONFLICT_ALWAYS_ON", False),
-        allow_override=env_bool("PROMPT_CONFLICT_ALLOW_OVERRIDE", True),
-        tmp_dir=env_path("PROMPT_CONFLICT_TMP_DIR", "/tmp/prompt-conflicts"),
+        token_threshold=parse_int(threshold, 1800),
+        always_on=parse_bool(always_on, False),
+        allow_override=parse_bool(allow_override, True),
+        tmp_dir=Path(tmp_dir or "/tmp/prompt-conflicts"),
         skip_prefix=skip_prefix,
         skip_prefix_lower=skip_prefix.lower(),
+        interactive=not parse_bool(ci, False) and any(display),
     )
 
 
@@ -111,8 +211,7 @@ def load_config() -> Config:
 # Hook Input Parsing
 # ============================================================================
 
-@dataclass(slots=True, frozen=True)
-class HookInput:
+class HookInput(NamedTuple):
     """Parsed UserPromptSubmit hook input."""
 
     session_id: str
@@ -126,15 +225,16 @@ class HookInputError(Exception):
     """Raised when hook input cannot be parsed."""
 
 
-def read_hook_input() -> HookInput:
-    """Parse UserPromptSubmit JSON from stdin."""
-    raw = sys.stdin.read().strip()
-    if not raw:
+def parse_hook_input(raw: str | bytes) -> HookInput:
+    """Parse UserPromptSubmit JSON text or UTF-8 bytes."""
+    # JSON parsers skip surrounding whitespace; only reject all-blank input
+    # rather than strip()-copying the whole payload.
+    if not raw or raw.isspace():
         raise HookInputError("No input received on stdin")
 
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as e:
+        data = _json_loads(raw)
+    except ValueError as e:  # JSONDecodeError, or UnicodeDecodeError on bad bytes
         raise HookInputError(f"Invalid JSON: {e}") from e
 
     if not isinstance(data, dict):
@@ -157,20 +257,27 @@ def read_hook_input() -> HookInput:
 # Hook Output Emission
 # ============================================================================
 
+def _write_json(obj: dict[str, Any]) -> None:
+    """Write one compact JSON line straight to fd 1, bypassing sys.stdout."""
+    data = memoryview(_json_dumps(obj) + b"\n")
+    while data:
+        data = data[os.write(1, data):]
+
+
 def emit_block(reason: str) -> NoReturn:
     """Emit blocking decision and exit."""
-    print(json.dumps({"decision": "block", "reason": reason}))
+    _write_json({"decision": "block", "reason": reason})
     sys.exit(0)
 
 
 def emit_context(context: str) -> NoReturn:
     """Emit additional context to inject into the conversation and exit."""
-    print(json.dumps({
+    _write_json({
         "hookSpecificOutput": {
             "hookEventName": "UserPromptSubmit",
             "additionalContext": context,
         },
-    }))
+    })
     sys.exit(0)
 
 
@@ -189,128 +296,201 @@ def exit_error(message: str) -> NoReturn:
 # Prompt Storage
 # ============================================================================
 
-@dataclass(slots=True, frozen=True)
-class StoredPrompt:
+@functools.lru_cache(maxsize=1)
+def _digest10_backend() -> Callable[[bytes], str]:
+    """Pick the filename digest backend once per process (a failed import isn't cached)."""
+    try:
+        import blake3
+    except ImportError:
+        import hashlib
+        return lambda data: hashlib.blake2b(data, digest_size=5).hexdigest()
+    return lambda data: blake3.blake3(data).hexdigest(5)
+
+
+def _digest10(data: bytes) -> str:
+    """10-hex filename discriminator (40 bits); needs no cryptographic strength."""
+    return _digest10_backend()(data)
+
+
+class StoredPrompt(NamedTuple):
     """Information about a prompt saved to disk."""
 
-    path: Path
+    path: str
     filename: str
 
 
+# Last prompt stored by this process, as ((tmp_dir, session, digest), StoredPrompt).
+# Lets a daemon answer a retried prompt without rewriting it.
+_LAST_STORED: tuple[tuple[str, str, str], StoredPrompt] | None = None
+
+
+def _is_current(stored: StoredPrompt, latest_path: str) -> bool:
+    """True if the stored file still exists and latest.md still points at it."""
+    try:
+        st, lt = os.stat(stored.path), os.stat(latest_path)
+    except OSError:
+        return False
+    return (st.st_dev, st.st_ino) == (lt.st_dev, lt.st_ino)
+
+
+def _write_file_atomic(path: str, data: bytes) -> None:
+    """Write data to path via a same-directory temp file and rename."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # e.g. ENOSPC: don't leave the temp file in the prompt directory
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def store_prompt(prompt: str, config: Config, session_id: str) -> StoredPrompt:
-    """Save prompt to timestamped file and create latest.md symlink."""
-    config.tmp_dir.mkdir(parents=True, exist_ok=True)
+    """Save prompt to timestamped file and point latest.md at it."""
+    global _LAST_STORED
+    import time
+
+    # Plain os/os.path calls: no Path objects built on the block path
+    tmp_dir = os.fspath(config.tmp_dir)
+    latest_path = os.path.join(tmp_dir, "latest.md")
+    data = prompt.encode("utf-8")
+    digest = _digest10(data)
+    sess_short = (session_id or "nosession").replace(os.sep, "_")[:8]
+
+    # The filename names the session, so only the same session's retry is reused
+    key = (tmp_dir, sess_short, digest)
+    if _LAST_STORED is not None and _LAST_STORED[0] == key and _is_current(_LAST_STORED[1], latest_path):
+        return _LAST_STORED[1]
 
+    os.makedirs(tmp_dir, exist_ok=True)
     timestamp = int(time.time())
-    sess_short = (session_id or "nosession").replace(os.sep, "_")[:8]
-    digest = hashlib.sha256(prompt.encode()).hexdigest()[:10]
     filename = f"{timestamp}-{sess_short}-{digest}.md"
 
-    file_path = config.tmp_dir / filename
-    file_path.write_text(prompt, encoding="utf-8")
+    # Write under a temp name and rename into place so readers never see a
+    # partial file
+    file_path = os.path.join(tmp_dir, filename)
+    _write_file_atomic(file_path, data)
 
-    # Create/update latest.md symlink
-    latest_path = config.tmp_dir / "latest.md"
+    # latest.md is a hardlink to the new file (no data copy); copy the bytes
+    # only where hardlinks are unsupported
     try:
-        latest_path.unlink(missing_ok=True)
         try:
-            latest_path.symlink_to(filename)
+            os.unlink(latest_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(file_path, latest_path)
         except OSError:
-            latest_path.write_text(prompt, encoding="utf-8")
+            _write_file_atomic(latest_path, data)
     except OSError:
         pass
 
-    return StoredPrompt(path=file_path, filename=filename)
+    stored = StoredPrompt(path=file_path, filename=filename)
+    _LAST_STORED = (key, stored)
+    return stored
 
 
 # ============================================================================
 # Clipboard Integration
 # ============================================================================
 
+_CLIPBOARD_CANDIDATES: dict[str, tuple[tuple[str, ...], ...]] = {
+    "darwin": (("pbcopy",),),
+    "win32": (("clip.exe",),),
+    "wsl": (("clip.exe",),),
+    "linux": (("xclip", "-selection", "clipboard"), ("xsel", "--clipboard", "--input")),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def clipboard_commands() -> tuple[tuple[str, ...], ...]:
+    """Resolve the installed clipboard commands for this platform once per process."""
+    import shutil
+
+    if _PLATFORM in ("darwin", "win32"):
+        key = _PLATFORM
+    else:
+        key = "wsl" if _IS_WSL else "linux"
+    # PATH lookups only; nothing is spawned until a copy is attempted.
+    return tuple(
+        (exe, *cmd[1:]) for cmd in _CLIPBOARD_CANDIDATES[key] if (exe := shutil.which(cmd[0]))
+    )
+
+
 def copy_to_clipboard(text: str) -> bool:
     """Copy text to system clipboard. Returns True on success."""
-    text_bytes = text.encode()
-    devnull = subprocess.DEVNULL
-
-    try:
-        match _PLATFORM:
-            case "darwin":
-                subprocess.run(
-                    ["pbcopy"],
-                    input=text_bytes,
-                    check=True,
-                    stdout=devnull,
-                    stderr=devnull,
-                )
-                return True
-
-            case "win32":
-                subprocess.run(
-                    ["clip.exe"],
-                    input=text_bytes,
-                    check=True,
-                    stdout=devnull,
-                    stderr=devnull,
-                )
-                return True
-
-            case _ if _IS_WSL:
-                subprocess.run(
-                    ["clip.exe"],
-                    input=text_bytes,
-                    check=True,
-                    stdout=devnull,
-                    stderr=devnull,
-                )
-                return True
-
-            case _:  # Linux native
-                for cmd in (
-                    ["xclip", "-selection", "clipboard"],
-                    ["xsel", "--clipboard", "--input"],
-                ):
-                    try:
-                        subprocess.run(
-                            cmd,
-                            input=text_bytes,
-                            check=True,
-                            stdout=devnull,
-                            stderr=devnull,
-                        )
-                        return True
-                    except (FileNotFoundError, subprocess.CalledProcessError):
-                        continue
-                return False
-    except Exception:
+    commands = clipboard_commands()
+    if not commands:
         return False
 
+    import subprocess
+
+    text_bytes = text.encode()
+    # Usually a single exec; later tools are tried only if an installed one
+    # fails (e.g. xclip without an X server).
+    for cmd in commands:
+        try:
+            subprocess.run(
+                cmd,
+                input=text_bytes,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            return True
+        except (OSError, subprocess.CalledProcessError):
+            continue
+    return False
+
 
 # ============================================================================
 # Main Hook Logic
 # ============================================================================
 
-def handle_prompt(hook_input: HookInput, config: Config) -> None:
-    """Decide whether to block. Exits directly on block, returns on allow."""
+# Max leading whitespace chars skipped when looking for the skip prefix
+_SKIP_SCAN_LIMIT = 64
+
+
+def handle_prompt(hook_input: HookInput, config: Config) -> str | None:
+    """Decide whether to block. Returns the block reason, or None to allow."""
     prompt = hook_input.prompt
-    stripped = prompt.lstrip()
 
-    # Optional override: skip checking with special prefix
-    if config.allow_override and stripped.lower().startswith(config.skip_prefix_lower):
-        return  # allow
+    # Optional override: skip checking with special prefix. Only the leading
+    # whitespace and prefix window are inspected; the tail is never copied.
+    if config.allow_override:
+        pl = len(config.skip_prefix_lower)
+        head = prompt[:_SKIP_SCAN_LIMIT + pl].lstrip()
+        if head[:pl].lower() == config.skip_prefix_lower:
+            return None  # allow
+
+    # Short prompts pass through; skip the BPE pass when even the byte-length
+    # upper bound fits under the threshold
+    if not config.always_on and max_tokens(prompt) <= config.token_threshold:
+        return None  # allow
 
     token_count = count_tokens(prompt)
 
-    # Short prompts pass through
     if not config.always_on and token_count <= config.token_threshold:
-        return  # allow
+        return None  # allow
 
     # Long prompt detected - save to file and block
     stored = store_prompt(prompt, config, hook_input.session_id)
 
     slash_command = "/check-conflicts"
+    # Headless/CI sessions can't paste; don't fork a clipboard process there
+    copied = (config.interactive or sys.stdout.isatty()) and copy_to_clipboard(slash_command)
     clipboard_hint = (
         f"\n✓ Copied: {slash_command}\n   Paste and press Enter!"
-        if copy_to_clipboard(slash_command)
+        if copied
         else f"\n   Copy and submit: {slash_command}"
     )
 
@@ -326,19 +506,182 @@ This asks the agent to analyze the saved prompt for conflicting
 or ambiguous instructions.
 """
 
-    emit_block(reason)  # exits
+    return reason
+
+
+# ============================================================================
+# Daemon Mode (opt-in via PROMPT_CONFLICT_DAEMON)
+# ============================================================================
+
+_DAEMON_IDLE_SECONDS = 30 * 60
+_DAEMON_START_WAIT_SECONDS = 2.0
+_CLIENT_TIMEOUT_SECONDS = 10.0
+
+
+def daemon_socket_path() -> str | None:
+    """Per-user Unix socket path for the daemon, or None without $XDG_RUNTIME_DIR.
+
+    Only the private runtime dir is used: a fixed name in a shared directory
+    like /tmp could be pre-created by another local user.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        return None
+    return os.path.join(runtime_dir, "prompt-conflict.sock")
+
+
+def serve_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Handle one forwarded hook invocation inside the daemon."""
+    env = request.get("env")
+    config = load_config(env if isinstance(env, dict) else {})
+    try:
+        hook_input = parse_hook_input(str(request.get("input", "")))
+    except HookInputError as e:
+        return {"error": str(e)}
+    return {"block": handle_prompt(hook_input, config)}
+
+
+def main_server() -> NoReturn:
+    """Run the daemon: keep the tokenizer loaded and answer hook requests."""
+    import asyncio
+    import socket
+
+    path = daemon_socket_path()
+    if path is None:
+        sys.exit(0)
+    load_tokenizer()  # the whole point: pay the encoder build once
+
+    # Another daemon already owns the socket: leave it alone.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+            sys.exit(0)
+        except OSError:
+            pass
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        last_seen = loop.time()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal last_seen
+            last_seen = loop.time()
+            try:
+                request = _json_loads(await reader.read())
+                response = serve_request(request) if isinstance(request, dict) else {"error": "Bad request"}
+            except Exception as e:
+                response = {"error": f"Daemon error: {e}"}
+            writer.write(_json_dumps(response) + b"\n")
+            try:
+                await writer.drain()
+            finally:
+                writer.close()
+
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        server = await asyncio.start_unix_server(handle, path=path)
+        os.chmod(path, 0o600)
+        async with server:
+            while loop.time() - last_seen < _DAEMON_IDLE_SECONDS:
+                await asyncio.sleep(60)
+
+    try:
+        asyncio.run(run())
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    sys.exit(0)
+
+
+def main_client(raw: bytes) -> None:
+    """Forward the hook input to the daemon and exit with its decision.
+
+    Starts the daemon on first use. Returns (without exiting) only when the
+    daemon is unreachable, so the caller can fall back to in-process handling.
+    """
+    import socket
+    import subprocess
+    import time
+
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    path = daemon_socket_path()
+    if path is None:
+        return
+    try:
+        # Strict, like the in-process parse: bad UTF-8 is reported there
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return
+    env = {k: os.environ[k] for k in _CONFIG_ENV_KEYS if k in os.environ}
+    request = _json_dumps({"input": text, "env": env})
+
+    deadline = time.monotonic() + _DAEMON_START_WAIT_SECONDS
+    spawned = False
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(_CLIENT_TIMEOUT_SECONDS)
+                sock.connect(path)
+                # Only talk to a daemon run by this user
+                if os.stat(path).st_uid != os.getuid():
+                    return
+                sock.sendall(request)
+                sock.shutdown(socket.SHUT_WR)
+                chunks = []
+                while chunk := sock.recv(65536):
+                    chunks.append(chunk)
+            response = _json_loads(b"".join(chunks))
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not spawned:
+                subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "--daemon"],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+                spawned = True
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(0.05)
+        except (OSError, ValueError):
+            return
+
+    if not isinstance(response, dict):
+        return
+    if response.get("error"):
+        exit_error(f"[prompt_conflict] {response['error']}")
+    if response.get("block"):
+        emit_block(str(response["block"]))
+    exit_allow()
 
 
 def main() -> NoReturn:
     """Entry point."""
+    if "--daemon" in sys.argv[1:]:
+        main_server()
+
+    raw = sys.stdin.buffer.read()
+    if env_bool("PROMPT_CONFLICT_DAEMON", False):
+        main_client(raw)  # exits unless the daemon is unreachable
+
     config = load_config()
 
     try:
-        hook_input = read_hook_input()
+        hook_input = parse_hook_input(raw)
     except HookInputError as e:
         exit_error(f"[prompt_conflict] {e}")
 
-    handle_prompt(hook_input, config)
+    reason = handle_prompt(hook_input, config)
+    if reason:
+        emit_block(reason)
     exit_allow()
 
 
@@ -9,19 +9,23 @@ Principles:
 from __future__ import annotations
 
 import argparse
+import functools
 import os
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any
 
-from ..core.controller import RewindController
+if TYPE_CHECKING:
+    from ..core.controller import RewindController
 
 
 DEFAULT_LIST_LIMIT = 20
 DEFAULT_GC_KEEP = 50
 
+# Chat column marker, indexed by CheckpointMetadata.has_transcript.
+_CHAT_ICONS = ("  ", "💬")
+
 
 @dataclass(frozen=True, slots=True)
 class Selection:
@@ -29,28 +33,12 @@ class Selection:
     intent: str  # "jump" | "code" | "chat"
 
 
-def create_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="rewind",
-        description="System Zero Rewind - checkpoints + jump for AI coding agent sessions",
-    )
-    parser.add_argument(
-        "--version",
-        "-v",
-        action="version",
-        version="%(prog)s 1.0.0",
-    )
-    parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug output",
-    )
-
-    subparsers = parser.add_subparsers(dest="command")
-
+def _add_save(subparsers: Any) -> None:
     save = subparsers.add_parser("save", help="Create a checkpoint")
     save.add_argument("message", nargs="*", help="Optional description")
 
+
+def _add_jump(subparsers: Any) -> None:
     jump = subparsers.add_parser("jump", help="Jump to a checkpoint (restore code + fork chat)")
     jump.add_argument(
         "selector",
@@ -59,10 +47,16 @@ def create_parser() -> argparse.ArgumentParser:
         help="last | prev | N | <checkpoint-name>",
     )
 
+
+def _add_list(subparsers: Any) -> None:
     subparsers.add_parser("list", help="List recent checkpoints")
 
+
+def _add_gc(subparsers: Any) -> None:
     subparsers.add_parser("gc", help="Garbage collect old checkpoints")
 
+
+def _add_back(subparsers: Any) -> None:
     back = subparsers.add_parser(
         "back",
         help="Rewind by the last N user prompts (non-interactive, fast)",
@@ -90,6 +84,8 @@ def create_parser() -> argparse.ArgumentParser:
         help="Copy reverted prompt(s) to clipboard (best-effort)",
     )
 
+
+def _add_rewrite_chat(subparsers: Any) -> None:
     rewrite = subparsers.add_parser(
         "rewrite-chat",
         help="DESTRUCTIVE: rewrite current chat transcript in-place",
@@ -101,38 +97,90 @@ def create_parser() -> argparse.ArgumentParser:
         help="last | prev | N | <checkpoint-name>",
     )
 
+
+# Subcommand builders, in help-listing order.
+_SUBCOMMANDS = {
+    "save": _add_save,
+    "jump": _add_jump,
+    "list": _add_list,
+    "gc": _add_gc,
+    "back": _add_back,
+    "rewrite-chat": _add_rewrite_chat,
+}
+
+
+def create_parser(argv: list[str] | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    When `argv` names a known subcommand, only that subparser is constructed;
+    otherwise (no command, unknown command, or `argv` is None) all are.
+    """
+    parser = argparse.ArgumentParser(
+        prog="rewind",
+        description="System Zero Rewind - checkpoints + jump for AI coding agent sessions",
+    )
+    parser.add_argument(
+        "--version",
+        "-v",
+        action="version",
+        version="%(prog)s 1.0.0",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug output",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    # Top-level options take no values, so the first positional is the command.
+    command = next((a for a in argv if not a.startswith("-")), None) if argv is not None else None
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](subparsers)
+    else:
+        for add in _SUBCOMMANDS.values():
+            add(subparsers)
+
     return parser
 
 
 def main(args: list[str] | None = None) -> int:
-    parser = create_parser()
-    parsed = parser.parse_args(args)
+    argv = sys.argv[1:] if args is None else args
+    parser = create_parser(argv)
+    parsed = parser.parse_args(argv)
 
     if parsed.debug:
         os.environ["REWIND_DEBUG"] = "1"
 
-    controller = RewindController(project_root=_determine_project_root())
-
+    # The controller is built only on the branch that needs it.
     if not parsed.command:
-        return cmd_interactive(controller)
+        return cmd_interactive(_controller())
 
     if parsed.command == "save":
-        return cmd_save(parsed, controller)
+        return cmd_save(parsed, _controller())
     if parsed.command == "jump":
-        return cmd_jump(parsed, controller)
+        return cmd_jump(parsed, _controller())
     if parsed.command == "list":
-        return cmd_list(controller)
+        return cmd_list(_controller())
     if parsed.command == "gc":
-        return cmd_gc(controller)
+        return cmd_gc(_controller())
     if parsed.command == "back":
-        return cmd_back(parsed, controller)
+        return cmd_back(parsed, _controller())
     if parsed.command == "rewrite-chat":
-        return cmd_rewrite_chat(parsed, controller)
+        return cmd_rewrite_chat(parsed, _controller())
 
     parser.print_help()
     return 1
 
 
+def _controller() -> RewindController:
+    # Imported here so help/usage paths never load the core modules. Built per
+    # main() call: the project root comes from the current cwd/environment.
+    from ..core.controller import RewindController
+
+    return RewindController(project_root=_determine_project_root())
+
+
 def cmd_save(args: argparse.Namespace, controller: RewindController) -> int:
     description = " ".join(args.message).strip() if args.message else "Manual checkpoint"
     result = controller.create_checkpoint(description=description)
@@ -146,14 +194,8 @@ def cmd_save(args: argparse.Namespace, controller: RewindController) -> int:
 
 
 def cmd_jump(args: argparse.Namespace, controller: RewindController) -> int:
-    checkpoints = controller.list_checkpoints()
-    if not checkpoints:
-        print("No checkpoints found.")
-        return 1
-
-    name = resolve_selector(args.selector, checkpoints)
+    name = _resolve_or_report(args.selector, controller)
     if not name:
-        print("Invalid selector or checkpoint not found.")
         return 1
 
     result = controller.restore(name=name, mode="all", skip_backup=False)
@@ -168,13 +210,12 @@ def cmd_list(controller: RewindController) -> int:
 
     shown = checkpoints[:DEFAULT_LIST_LIMIT]
 
-    print("#  Chat  Name                       Files   Description")
+    lines = ["#  Chat  Name                       Files   Description"]
     for idx, cp in enumerate(shown, 1):
-        chat_icon = "💬" if getattr(cp, "has_transcript", False) else "  "
-        name = cp.name
-        files = str(cp.file_count)
+        chat_icon = _CHAT_ICONS[bool(cp.has_transcript)]
         desc = (cp.description or "").strip()
-        print(f"{idx:<2} {chat_icon:<4} {name:<26} {files:<6} {desc}")
+        lines.append(f"{idx:<2} {chat_icon:<4} {cp.name:<26} {cp.file_count!s:<6} {desc}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     if len(checkpoints) > DEFAULT_LIST_LIMIT:
         print(f"\nShowing last {DEFAULT_LIST_LIMIT}. Use `rewind` to search older checkpoints.")
@@ -216,14 +257,8 @@ def cmd_gc(controller: RewindController) -> int:
 
 
 def cmd_rewrite_chat(args: argparse.Namespace, controller: RewindController) -> int:
-    checkpoints = controller.list_checkpoints()
-    if not checkpoints:
-        print("No checkpoints found.")
-        return 1
-
-    name = resolve_selector(args.selector, checkpoints)
+    name = _resolve_or_report(args.selector, controller)
     if not name:
-        print("Invalid selector or checkpoint not found.")
         return 1
 
     print("This will rewrite your current agent transcript in-place.")
@@ -233,7 +268,7 @@ def cmd_rewrite_chat(args: argparse.Namespace, controller: RewindController) ->
         print("Canceled.")
         return 0
 
-    result = cast(Any, controller).restore(name=name, mode="context", skip_backup=True, transcript_restore="in_place")
+    result = controller.restore(name=name, mode="context", skip_backup=True, transcript_restore="in_place")
     return _print_restore_result(result)
 
 
@@ -255,25 +290,30 @@ def cmd_back(args: argparse.Namespace, controller: RewindController) -> int:
     prompts = result.get("prompts")
     prompts_list = prompts if isinstance(prompts, list) else []
 
+    # Diagnostics are collected and written to stderr in one go.
+    notes: list[str] = []
     if result.get("codeCheckpoint"):
-        print(f"Code restored to: {result['codeCheckpoint']}", file=sys.stderr)
+        notes.append(f"Code restored to: {result['codeCheckpoint']}")
     if result.get("note"):
-        print(str(result.get("note")), file=sys.stderr)
+        notes.append(str(result.get("note")))
 
     prompts_text = "\n\n".join(str(p) for p in prompts_list if p is not None).strip()
     if prompts_text:
         if copy_prompts and _try_copy_to_clipboard(prompts_text):
-            print("Copied reverted prompt(s) to clipboard.", file=sys.stderr)
+            notes.append("Copied reverted prompt(s) to clipboard.")
         else:
-            _print_reverted_prompts(prompts_list, n=n)
+            notes.extend(_format_reverted_prompts(prompts_list, n=n))
 
-    if result.get("forkCreated"):
-        print(f"Fork created: {result.get('forkSessionId')}")
-        return 0
+    forked = bool(result.get("forkCreated"))
+    if not forked and result.get("backupPath"):
+        notes.append(f"Backup: {result.get('backupPath')}")
+    if notes:
+        sys.stderr.write("\n".join(notes) + "\n")
 
-    print("Chat rewritten in-place")
-    if result.get("backupPath"):
-        print(f"Backup: {result.get('backupPath')}", file=sys.stderr)
+    if forked:
+        print(f"Fork created: {result.get('forkSessionId')}")
+    else:
+        print("Chat rewritten in-place")
     return 0
 
 
@@ -305,16 +345,22 @@ def cmd_interactive(controller: RewindController) -> int:
 
 def interactive_select(checkpoints) -> Selection | None:
     filtered = checkpoints
+    # Lowercased search text per checkpoint, built once rather than per filter.
+    haystacks = [(cp, f"{cp.name} {cp.description or ''}".lower()) for cp in checkpoints]
+    # Matches of the last filter; a needle containing the last one can only
+    # match a subset of them, so refinements search that smaller pool.
+    last_needle, last_matches = "", haystacks
 
     while True:
-        print("\nPick a checkpoint (enter number, type to filter, or 'q' to quit):")
         shown = filtered[:30]
+        lines = ["\nPick a checkpoint (enter number, type to filter, or 'q' to quit):"]
         for idx, cp in enumerate(shown, 1):
-            chat_icon = "💬" if getattr(cp, "has_transcript", False) else "  "
+            chat_icon = _CHAT_ICONS[bool(cp.has_transcript)]
             desc = (cp.description or "").strip()
-            print(f"  {idx:>2}. {chat_icon} {cp.name}  {desc}")
+            lines.append(f"  {idx:>2}. {chat_icon} {cp.name}  {desc}")
         if len(filtered) > 30:
-            print(f"  ... and {len(filtered) - 30} more")
+            lines.append(f"  ... and {len(filtered) - 30} more")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         raw = input("> ").strip()
         if raw.lower() in {"q", "quit", "exit"}:
@@ -332,10 +378,15 @@ def interactive_select(checkpoints) -> Selection | None:
             continue
 
         needle = raw.lower()
-        filtered = [cp for cp in checkpoints if needle in (cp.name + " " + (cp.description or "")).lower()]
-        if not filtered:
+        pool = last_matches if last_needle and last_needle in needle else haystacks
+        matches = [(cp, haystack) for cp, haystack in pool if needle in haystack]
+        if matches:
+            filtered = [cp for cp, _ in matches]
+            last_needle, last_matches = needle, matches
+        else:
             print("No matches.")
             filtered = checkpoints
+            last_needle, last_matches = "", haystacks
 
     print("\nPick an intent:")
     print("  1) Jump        (restore code + fork chat)  [default]")
@@ -352,22 +403,35 @@ def interactive_select(checkpoints) -> Selection | None:
     return Selection(checkpoint=chosen, intent=intent)
 
 
-def resolve_selector(selector: str, checkpoints) -> str | None:
+def resolve_selector(selector: str, controller: RewindController) -> str | None:
+    """Resolve a selector, reading only the checkpoints it needs."""
     s = (selector or "last").strip()
     if not s or s == "last":
-        return checkpoints[0].name
+        head = controller.head_checkpoints(1)
+        return head[0].name if head else None
     if s == "prev":
-        return checkpoints[1].name if len(checkpoints) > 1 else None
+        head = controller.head_checkpoints(2)
+        return head[1].name if len(head) > 1 else None
     if s.isdigit():
         n = int(s)
-        if 1 <= n <= len(checkpoints):
-            return checkpoints[n - 1].name
-        return None
+        if n < 1:
+            return None
+        head = controller.head_checkpoints(n)
+        return head[n - 1].name if len(head) >= n else None
 
     # Exact name match
-    for cp in checkpoints:
-        if cp.name == s:
-            return cp.name
+    cp = controller.get_checkpoint(s)
+    return cp.name if cp else None
+
+
+def _resolve_or_report(selector: str, controller: RewindController) -> str | None:
+    name = resolve_selector(selector, controller)
+    if name:
+        return name
+    if not controller.head_checkpoints(1):
+        print("No checkpoints found.")
+    else:
+        print("Invalid selector or checkpoint not found.")
     return None
 
 
@@ -408,38 +472,48 @@ def _prompt_int(prompt: str, default: int) -> int:
 
 
 def _determine_project_root() -> Path:
-    val = os.environ.get("REWIND_PROJECT_ROOT")
-    if isinstance(val, str) and val.strip():
-        return Path(val.strip()).expanduser()
+    val = (os.environ.get("REWIND_PROJECT_ROOT") or "").strip()
+    if val:
+        return Path(val).expanduser()
     return Path.cwd()
 
 
-def _print_reverted_prompts(prompts: list[Any], *, n: int) -> None:
+def _format_reverted_prompts(prompts: list[Any], *, n: int) -> list[str]:
     clean = [str(p).strip() for p in prompts if p is not None and str(p).strip()]
     if not clean:
-        return
-    print(f"Reverted prompts (n={n}):", file=sys.stderr)
-    print("---", file=sys.stderr)
-    print("\n\n".join(clean), file=sys.stderr)
-    print("---", file=sys.stderr)
+        return []
+    return [f"Reverted prompts (n={n}):", "---", "\n\n".join(clean), "---"]
+
+
+_CLIPBOARD_CANDIDATES: tuple[tuple[str, ...], ...] = (
+    ("pbcopy",),
+    ("wl-copy",),
+    ("xclip", "-selection", "clipboard"),
+    ("xsel", "--clipboard", "--input"),
+    ("clip.exe",),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _clipboard_commands() -> tuple[tuple[str, ...], ...]:
+    # PATH lookups only; nothing is spawned until a copy is attempted.
+    import shutil
+
+    return tuple(cmd for cmd in _CLIPBOARD_CANDIDATES if shutil.which(cmd[0]))
 
 
 def _try_copy_to_clipboard(text: str) -> bool:
     if not text:
         return False
 
-    candidates: list[list[str]] = [
-        ["pbcopy"],
-        ["wl-copy"],
-        ["xclip", "-selection", "clipboard"],
-        ["xsel", "--clipboard", "--input"],
-        ["clip.exe"],
-    ]
+    import subprocess
 
     data = text.encode("utf-8")
-    for cmd in candidates:
+    # Usually a single exec; later tools are tried only if an installed one fails
+    # (e.g. xclip without a display).
+    for cmd in _clipboard_commands():
         try:
-            proc = subprocess.run(
+            subprocess.run(
                 cmd,
                 input=data,
                 stdout=subprocess.DEVNULL,
@@ -447,8 +521,7 @@ def _try_copy_to_clipboard(text: str) -> bool:
                 check=True,
                 timeout=2,
             )
-            if proc.returncode == 0:
-                return True
+            return True
         except Exception:
             continue
     return False
@@ -6,36 +6,48 @@ Handles loading and merging configuration from multiple sources.
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Literal, cast
 
 from ..utils.env import get_global_rewind_dir
-from ..utils.fs import safe_json_load
+from ..utils.fs import atomic_write, cached_json_load
 from ..utils.resources import read_json_resource, resource_exists
-from .types import IgnoreConfig, RewindConfig, TierConfig
+from .types import IgnoreConfig, RewindConfig, StorageMode, TierConfig
 
 
 PresetName = Literal["minimal", "balanced", "aggressive"]
 
+_PRESETS: frozenset[str] = frozenset(("minimal", "balanced", "aggressive"))
+
+_STORAGE_MODES: frozenset[str] = frozenset(mode.value for mode in StorageMode)
+
+# Default for JSON loads that must tell "absent" apart from an empty object.
+_MISSING: Any = object()
+
 
 def _coerce_preset(val: object, default: PresetName = "balanced") -> PresetName:
-    if isinstance(val, str) and val in {"minimal", "balanced", "aggressive"}:
-        return cast(PresetName, val)
-    return default
+    return cast(PresetName, val) if isinstance(val, str) and val in _PRESETS else default
+
+
+@lru_cache(maxsize=8)
+def _read_bundled_json(*parts: str) -> Any:
+    """Parse a packaged schema once per process; None if it isn't bundled."""
+    if not resource_exists(*parts):
+        return None
+    return read_json_resource(*parts)
 
 
 def _read_preset_definition(preset: PresetName) -> dict[str, Any]:
-    if resource_exists("schemas", "tiers", f"{preset}.json"):
-        data = read_json_resource("schemas", "tiers", f"{preset}.json")
+    # Parsed definitions are cached and shared: treat them as read-only.
+    data = _read_bundled_json("schemas", "tiers", f"{preset}.json")
+    if data is not None:
         return data if isinstance(data, dict) else {}
 
     # Installed system fallback.
     system_path = get_global_rewind_dir() / "system" / "src" / "schemas" / "tiers" / f"{preset}.json"
-    if system_path.exists():
-        data = safe_json_load(system_path, {})
-        return data if isinstance(data, dict) else {}
-
-    return {}
+    data = cached_json_load(system_path, {})
+    return data if isinstance(data, dict) else {}
 
 
 def _extract_runtime_overrides(config: dict[str, Any]) -> dict[str, Any]:
@@ -73,20 +85,27 @@ class ConfigLoader:
         Returns:
             Merged RewindConfig
         """
-        merged: dict[str, Any] = {}
+        sources: list[dict[str, Any]] = []
         
         # Load global config
+        # (parsed files are cached until their mtime changes, so reload() is cheap)
         global_config_path = get_global_rewind_dir() / "config.json"
-        if global_config_path.exists():
-            global_data = safe_json_load(global_config_path, {})
-            merged = self._deep_merge(merged, global_data)
+        global_data = cached_json_load(global_config_path, {})
+        if isinstance(global_data, dict) and global_data:
+            sources.append(global_data)
         
         # Load project config (overrides global)
         if self.project_root:
             project_config_path = self.project_root / ".agent" / "rewind" / "config.json"
-            if project_config_path.exists():
-                project_data = safe_json_load(project_config_path, {})
-                merged = self._deep_merge(merged, project_data)
+            project_data = cached_json_load(project_config_path, {})
+            if isinstance(project_data, dict) and project_data:
+                sources.append(project_data)
+        
+        # A single source is used as-is (read-only); only layered sources are merged.
+        merged: dict[str, Any] = sources[0] if len(sources) == 1 else {}
+        if len(sources) > 1:
+            for data in sources:
+                self._deep_merge_into(merged, data)
         
         # Resolve preset + runtime.
         preset = _coerce_preset(merged.get("preset"), "balanced")
@@ -96,27 +115,24 @@ class ConfigLoader:
         runtime_overrides = _extract_runtime_overrides(merged)
         effective_runtime = self._deep_merge(preset_runtime, runtime_overrides)
 
-        tier_config = TierConfig.from_dict(
-            {
-                "tier": preset,
-                "description": preset_def.get("description", "") if isinstance(preset_def.get("description"), str) else "",
-                **effective_runtime,
-            }
-        )
+        tier_data = {
+            "tier": preset,
+            "description": preset_def.get("description", "") if isinstance(preset_def.get("description"), str) else "",
+            **effective_runtime,
+        }
 
         storage_data = merged.get("storage", {})
         storage_mode_str = storage_data.get("mode", "project") if isinstance(storage_data, dict) else "project"
 
-        ignore_config = IgnoreConfig.from_dict(merged.get("ignore", {}))
-
-        storage_mode = RewindConfig().storage_mode
-        if isinstance(storage_mode_str, str) and storage_mode_str in {"project", "global"}:
-            storage_mode = RewindConfig.from_dict({"storage": {"mode": storage_mode_str}}).storage_mode
+        storage_mode = StorageMode.PROJECT
+        if isinstance(storage_mode_str, str) and storage_mode_str in _STORAGE_MODES:
+            storage_mode = StorageMode(storage_mode_str)
 
+        # Tier and ignore settings are parsed lazily, on first access.
         return RewindConfig(
             storage_mode=storage_mode,
-            tier=tier_config,
-            ignore=ignore_config,
+            tier_data=tier_data,
+            ignore_data=merged.get("ignore", {}),
         )
     
     def reload(self) -> RewindConfig:
@@ -134,7 +150,7 @@ class ConfigLoader:
         """
         if preset_name is None:
             global_config_path = get_global_rewind_dir() / "config.json"
-            global_data = safe_json_load(global_config_path, {}) if global_config_path.exists() else {}
+            global_data = cached_json_load(global_config_path, {})
             preset = _coerce_preset(global_data.get("preset"), "balanced")
             overrides = _extract_runtime_overrides(global_data)
         else:
@@ -161,13 +177,13 @@ class ConfigLoader:
         """
         # Try installed system config first (most up-to-date after install)
         system_path = get_global_rewind_dir() / "system" / "src" / "schemas" / "rewind-checkpoint-ignore.json"
-        if system_path.exists():
-            data = safe_json_load(system_path, {})
+        data = cached_json_load(system_path, _MISSING)
+        if isinstance(data, dict):
             return IgnoreConfig.from_dict(data)
 
         # Try bundled config in package resources.
-        if resource_exists("schemas", "rewind-checkpoint-ignore.json"):
-            data = read_json_resource("schemas", "rewind-checkpoint-ignore.json")
+        data = _read_bundled_json("schemas", "rewind-checkpoint-ignore.json")
+        if data is not None:
             return IgnoreConfig.from_dict(data)
         
         # Return default
@@ -196,12 +212,37 @@ class ConfigLoader:
                 raise ValueError("No project root set for project-scope config")
             config_path = self.project_root / ".agent" / "rewind" / "config.json"
         
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w") as f:
-            json.dump(data, f, indent=2)
+        # One buffered write through a temp file + rename; never half-written.
+        atomic_write(config_path, json.dumps(data, indent=2))
         
         return config_path
     
+    @staticmethod
+    def _deep_merge_into(target: dict, override: dict) -> dict:
+        """Deep merge a dictionary into target, in place.
+        
+        Nested dicts in target are copied before being written to, so dicts
+        shared with the inputs (e.g. cached config files) are never mutated.
+        
+        Args:
+            target: Dictionary to merge into (modified and returned)
+            override: Dictionary to merge (takes precedence)
+            
+        Returns:
+            target
+        """
+        stack = [(target, override)]
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                current = dst.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    current = dst[key] = current.copy()
+                    stack.append((current, value))
+                else:
+                    dst[key] = value
+        return target
+    
     @staticmethod
     def _deep_merge(base: dict, override: dict) -> dict:
         """Deep merge two dictionaries.
@@ -213,10 +254,6 @@ class ConfigLoader:
         Returns:
             Merged dictionary
         """
-        result = base.copy()
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = ConfigLoader._deep_merge(result[key], value)
-            else:
-                result[key] = value
-        return result
+        if not override:
+            return base.copy()
+        return ConfigLoader._deep_merge_into(base.copy(), override)
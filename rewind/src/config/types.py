@@ -5,9 +5,76 @@ Defines dataclasses for all configuration structures.
 
 from __future__ import annotations
 
+import fnmatch
+import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Literal
+from itertools import chain
+from typing import Any, Callable, Iterable, Literal
+
+
+_TIERS: frozenset[str] = frozenset(("minimal", "balanced", "aggressive"))
+
+_GLOB_MAGIC = re.compile(r"[*?[]")
+
+_IGNORE_PATTERN_FIELDS: frozenset[str] = frozenset(("patterns", "additional_ignores", "force_include"))
+
+
+def _compile_globs(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Combine glob patterns into one regex, meant for `fullmatch`.
+    
+    Args:
+        patterns: fnmatch-style glob patterns
+        
+    Returns:
+        Compiled alternation of all patterns, or None if there are none
+    """
+    parts = ["(?:" + fnmatch.translate(p).removesuffix(r"\Z") + ")" for p in patterns]
+    return re.compile("|".join(parts)) if parts else None
+
+
+# Shared defaults; each config instance gets its own list copy.
+_DEFAULT_CRITICAL_FILES: tuple[str, ...] = (
+    "package.json",
+    "requirements.txt",
+    "Dockerfile",
+    "docker-compose.yml",
+    "tsconfig.json",
+    "pyproject.toml",
+    "Cargo.toml",
+    "go.mod",
+    "*.config.js",
+    "*.config.ts",
+)
+
+_DEFAULT_IGNORE_PATTERNS: tuple[str, ...] = (
+    ".git",
+    ".agent",
+    ".claude",
+    ".factory",
+    "node_modules",
+    "__pycache__",
+    ".pytest_cache",
+    "dist",
+    "build",
+    "coverage",
+    "out",
+    "tmp",
+    "temp",
+    "*.log",
+    "*.tmp",
+    "*.pyc",
+    ".cache",
+    ".next",
+    ".nuxt",
+    "*.swp",
+    "*.bak",
+    ".venv",
+    "venv",
+    ".env",
+)
+
+_DEFAULT_FORCE_INCLUDE: tuple[str, ...] = (".env.example",)
 
 
 class StorageMode(str, Enum):
@@ -28,18 +95,7 @@ class SignificanceConfig:
     """Settings for determining if changes are significant enough to checkpoint."""
     enabled: bool = True
     min_change_size: int = 50  # bytes
-    critical_files: list[str] = field(default_factory=lambda: [
-        "package.json",
-        "requirements.txt",
-        "Dockerfile",
-        "docker-compose.yml",
-        "tsconfig.json",
-        "pyproject.toml",
-        "Cargo.toml",
-        "go.mod",
-        "*.config.js",
-        "*.config.ts",
-    ])
+    critical_files: list[str] = field(default_factory=lambda: list(_DEFAULT_CRITICAL_FILES))
 
 
 @dataclass
@@ -58,7 +114,7 @@ class TierConfig:
 
         tier_val = data.get("tier", "balanced")
         tier: Literal["minimal", "balanced", "aggressive"] = "balanced"
-        if isinstance(tier_val, str) and tier_val in {"minimal", "balanced", "aggressive"}:
+        if isinstance(tier_val, str) and tier_val in _TIERS:
             tier = tier_val
         
         return cls(
@@ -71,7 +127,11 @@ class TierConfig:
             significance=SignificanceConfig(
                 enabled=significance_data.get("enabled", True),
                 min_change_size=significance_data.get("minChangeSize", 50),
-                critical_files=significance_data.get("criticalFiles", SignificanceConfig().critical_files),
+                critical_files=(
+                    list(significance_data["criticalFiles"])
+                    if "criticalFiles" in significance_data
+                    else list(_DEFAULT_CRITICAL_FILES)
+                ),
             ),
         )
 
@@ -79,44 +139,66 @@ class TierConfig:
 @dataclass
 class IgnoreConfig:
     """Patterns for files to ignore during checkpointing."""
-    patterns: list[str] = field(default_factory=lambda: [
-        ".git",
-        ".agent",
-        ".claude",
-        ".factory",
-        "node_modules",
-        "__pycache__",
-        ".pytest_cache",
-        "dist",
-        "build",
-        "coverage",
-        "out",
-        "tmp",
-        "temp",
-        "*.log",
-        "*.tmp",
-        "*.pyc",
-        ".cache",
-        ".next",
-        ".nuxt",
-        "*.swp",
-        "*.bak",
-        ".venv",
-        "venv",
-        ".env",
-    ])
+    patterns: list[str] = field(default_factory=lambda: list(_DEFAULT_IGNORE_PATTERNS))
     additional_ignores: list[str] = field(default_factory=list)
-    force_include: list[str] = field(default_factory=lambda: [
-        ".env.example",
-    ])
+    force_include: list[str] = field(default_factory=lambda: list(_DEFAULT_FORCE_INCLUDE))
+    _force_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _full_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _tail_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _literal_components: frozenset[str] = field(init=False, repr=False, compare=False)
+    _suffixes: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _component_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _component_cache: dict[str, bool] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._compile()
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # Reassigning a pattern list recompiles; in-place list edits are not seen
+        if name in _IGNORE_PATTERN_FIELDS and "_component_cache" in self.__dict__:
+            self._compile()
+    
+    def _compile(self) -> None:
+        """Translate the pattern lists into the matchers used by should_ignore."""
+        literals: set[str] = set()
+        suffixes: list[str] = []
+        component_globs: list[str] = []
+        globs: list[str] = []  # component globs plus patterns containing "/"
+        for pattern in chain(self.patterns, self.additional_ignores):
+            if "/" in pattern:
+                globs.append(pattern)
+            elif not _GLOB_MAGIC.search(pattern):
+                literals.add(pattern)
+            elif pattern[0] == "*" and not _GLOB_MAGIC.search(pattern, 1):
+                suffixes.append(pattern[1:])
+            else:
+                component_globs.append(pattern)
+                globs.append(pattern)
+        
+        self._force_re = _compile_globs(self.force_include)
+        # Literal and `*suffix` patterns can only match within one component, so
+        # the per-component checks cover them; `*` in other globs may span "/".
+        self._full_re = _compile_globs(
+            variant for pattern in globs for variant in (pattern, f"*/{pattern}", f"{pattern}/*")
+        )
+        # Without the `pattern/*` variant: for entries below accepted directories
+        self._tail_re = _compile_globs(
+            variant for pattern in globs for variant in (pattern, f"*/{pattern}")
+        )
+        self._literal_components = frozenset(literals)
+        self._suffixes = tuple(suffixes)
+        self._component_re = _compile_globs(component_globs)
+        self._component_cache = {}
     
     @classmethod
     def from_dict(cls, data: dict) -> IgnoreConfig:
         """Create IgnoreConfig from dictionary."""
+        # Lists are copied: `data` may be a cached, shared parse of a config file.
         return cls(
-            patterns=data.get("ignorePatterns", cls().patterns),
-            additional_ignores=data.get("additionalIgnores", []),
-            force_include=data.get("forceInclude", []),
+            patterns=list(data["ignorePatterns"]) if "ignorePatterns" in data else list(_DEFAULT_IGNORE_PATTERNS),
+            additional_ignores=list(data.get("additionalIgnores", [])),
+            force_include=list(data.get("forceInclude", [])),
         )
     
     def should_ignore(self, path: str) -> bool:
@@ -128,33 +210,115 @@ class IgnoreConfig:
         Returns:
             True if path should be ignored
         """
-        import fnmatch
-        
         # Check force include first
-        for pattern in self.force_include:
-            if fnmatch.fnmatch(path, pattern):
-                return False
+        if self._force_re is not None and self._force_re.fullmatch(path):
+            return False
+        
+        # Check ignore patterns against the whole path, then each component
+        if self._full_re is not None and self._full_re.fullmatch(path):
+            return True
+        return any(self._component_ignored(part) for part in path.split("/"))
+    
+    def should_ignore_entry(self, name: str, path: str, parent_forced: bool = False) -> bool:
+        """Check an entry whose parent directory was already accepted.
         
-        # Check ignore patterns
-        all_patterns = self.patterns + self.additional_ignores
-        for pattern in all_patterns:
-            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(path, f"*/{pattern}") or fnmatch.fnmatch(path, f"{pattern}/*"):
-                return True
-            # Also check if any path component matches
-            parts = path.split("/")
-            for part in parts:
-                if fnmatch.fnmatch(part, pattern):
-                    return True
+        Equivalent to `should_ignore(path)`. Unless an ancestor was only kept
+        by force_include (`parent_forced`, see `force_overrides`), no ancestor
+        matches an ignore pattern, so only the last component and the
+        whole-path globs are tested, and `pattern/*` can be skipped: it
+        matches only below a path matching `pattern`.
         
-        return False
+        Args:
+            name: Last component of `path`
+            path: Relative path to check
+            parent_forced: Whether an ancestor was kept only by force_include
+            
+        Returns:
+            True if path should be ignored
+        """
+        if parent_forced:
+            return self.should_ignore(path)
+        if self._force_re is not None and self._force_re.fullmatch(path):
+            return False
+        if self._component_ignored(name):
+            return True
+        return self._tail_re is not None and self._tail_re.fullmatch(path) is not None
+    
+    def force_overrides(self, path: str) -> bool:
+        """Check whether `path` matches an ignore pattern but is kept by force_include.
+        
+        Args:
+            path: Relative path to check
+            
+        Returns:
+            True if force_include is the only reason path is kept
+        """
+        if self._force_re is None or not self._force_re.fullmatch(path):
+            return False
+        if self._full_re is not None and self._full_re.fullmatch(path):
+            return True
+        return any(self._component_ignored(part) for part in path.split("/"))
+    
+    def _component_ignored(self, name: str) -> bool:
+        """Check a single path component against the ignore patterns (memoized)."""
+        cached = self._component_cache.get(name)
+        if cached is None:
+            cached = self._component_cache[name] = (
+                name in self._literal_components
+                or name.endswith(self._suffixes)
+                or (self._component_re is not None and self._component_re.fullmatch(name) is not None)
+            )
+        return cached
+
+
+class _ParsedOnAccess:
+    """Dataclass field default: the value passed to __init__, else parsed on first access.
+    
+    When the field is left as None, `parse` builds it from the instance's
+    `raw_field` attribute the first time it is read.
+    """
+    
+    def __init__(self, raw_field: str, parse: Callable[[dict[str, Any] | None], Any]) -> None:
+        self._raw_field = raw_field
+        self._parse = parse
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attr = "_" + name
+    
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return None  # The dataclass field default
+        value = obj.__dict__.get(self._attr)
+        if value is None:
+            value = obj.__dict__[self._attr] = self._parse(getattr(obj, self._raw_field))
+        return value
+    
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._attr] = value
+
+
+def _parse_tier(data: dict[str, Any] | None) -> TierConfig:
+    return TierConfig() if data is None else TierConfig.from_dict(data)
+
+
+def _parse_ignore(data: dict[str, Any] | None) -> IgnoreConfig:
+    return IgnoreConfig() if data is None else IgnoreConfig.from_dict(data)
 
 
 @dataclass
 class RewindConfig:
-    """Main Rewind configuration."""
+    """Main Rewind configuration.
+    
+    `tier` and `ignore` may be passed directly or left out and given as raw
+    `tier_data` / `ignore_data` instead, which are parsed on first access, so
+    commands that only need the storage mode never parse them. Equality
+    compares the parsed settings.
+    """
     storage_mode: StorageMode = StorageMode.PROJECT
-    tier: TierConfig = field(default_factory=TierConfig)
-    ignore: IgnoreConfig = field(default_factory=IgnoreConfig)
+    tier: TierConfig = _ParsedOnAccess("tier_data", _parse_tier)  # type: ignore[assignment]
+    ignore: IgnoreConfig = _ParsedOnAccess("ignore_data", _parse_ignore)  # type: ignore[assignment]
+    tier_data: dict[str, Any] | None = field(default=None, repr=False, compare=False, kw_only=True)
+    ignore_data: dict[str, Any] | None = field(default=None, repr=False, compare=False, kw_only=True)
     
     @classmethod
     def from_dict(cls, data: dict) -> RewindConfig:
@@ -168,7 +332,7 @@ class RewindConfig:
 
         preset_val = data.get("preset")
         preset: Literal["minimal", "balanced", "aggressive"] = "balanced"
-        if isinstance(preset_val, str) and preset_val in {"minimal", "balanced", "aggressive"}:
+        if isinstance(preset_val, str) and preset_val in _TIERS:
             preset = preset_val
 
         runtime_overrides = data.get("runtime", {})
@@ -176,6 +340,6 @@ class RewindConfig:
 
         return cls(
             storage_mode=StorageMode(mode_str) if mode_str in ("project", "global") else StorageMode.PROJECT,
-            tier=TierConfig.from_dict({"tier": preset, **runtime_dict}),
-            ignore=IgnoreConfig.from_dict(data.get("ignore", {})),
+            tier_data={"tier": preset, **runtime_dict},
+            ignore_data=data.get("ignore", {}),
         )
@@ -5,17 +5,62 @@ Handles creating, listing, and restoring file snapshots using tarfile.
 
 from __future__ import annotations
 
+import errno
+import io
 import json
 import os
 import shutil
+import stat
 import tarfile
 import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
 from ..config.types import IgnoreConfig
+from ..utils.fs import atomic_write, copy_file
+
+try:
+    import grp
+    import pwd
+except ImportError:  # pragma: no cover - not available on Windows
+    grp = pwd = None  # type: ignore[assignment]
+
+try:
+    from compression import zstd as _zstd  # noqa: F401  (stdlib on Python 3.14+)
+except ImportError:
+    _HAS_ZSTD = False
+else:
+    _HAS_ZSTD = True
+
+# Small files are read on a thread pool this many entries ahead of the tar writer;
+# larger ones are streamed by the writer itself to keep memory bounded.
+_READ_AHEAD = 32
+_MAX_PREFETCH_SIZE = 1024 * 1024
+
+@lru_cache(maxsize=32)
+def _owner_names(uid: int, gid: int) -> tuple[str, str]:
+    """User and group names for a tar header, as tarfile's gettarinfo looks them up."""
+    uname = gname = ""
+    if pwd is not None:
+        try:
+            uname = pwd.getpwuid(uid)[0]
+        except KeyError:
+            pass
+    if grp is not None:
+        try:
+            gname = grp.getgrgid(gid)[0]
+        except KeyError:
+            pass
+    return uname, gname
+
+
+# Full listings of more checkpoints than this read their metadata on a thread pool.
+_PARALLEL_LIST_MIN = 32
 
 
 @dataclass
@@ -69,13 +114,53 @@ class CheckpointResult:
     name: str = ""
     file_count: int = 0
     error: str | None = None
+    has_transcript: bool = False
+
+
+def _read_file(path: str, size: int) -> bytes:
+    """Read a file whose size is already known with raw os-level reads.
+    
+    Skips the fstat/seek probing and the trailing EOF read `read_bytes`
+    does; the result is at most `size` bytes even if the file grew.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _move_file(src: str, dst: Path) -> None:
+    """Move a file over `dst`: a rename on the same filesystem, else a copy."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        if os.path.islink(src):
+            shutil.copy2(src, dst, follow_symlinks=False)
+        else:
+            copy_file(src, dst)
 
 
 class CheckpointStore:
     """Manages checkpoint storage and retrieval."""
     
     ARCHIVE_NAME = "snapshot.tar.gz"
+    # Older snapshots may be zstd; reading those needs Python 3.14+
+    ZSTD_ARCHIVE_NAME = "snapshot.tar.zst"
+    ARCHIVE_NAMES = (ZSTD_ARCHIVE_NAME, ARCHIVE_NAME)
     METADATA_NAME = "metadata.json"
+    # Aggregated metadata of all checkpoints; a cache, metadata.json stays authoritative
+    INDEX_NAME = "index.json"
     
     def __init__(
         self,
@@ -101,27 +186,31 @@ class CheckpointStore:
         self,
         description: str = "",
         session_id: str | None = None,
+        transcript_hook: Callable[[Path], dict[str, Any] | None] | None = None,
     ) -> CheckpointResult:
         """Create a new checkpoint.
         
         Args:
             description: Human-readable description
             session_id: Optional session identifier
+            transcript_hook: Called with the checkpoint directory once the
+                archive is written; returns transcript metadata to record
+                (or None), so metadata.json is written only once
             
         Returns:
             CheckpointResult with success status and details
         """
         timestamp = datetime.now()
-        # Include milliseconds for uniqueness when creating multiple checkpoints quickly
-        name = timestamp.strftime("%Y%m%d_%H%M%S") + f"_{timestamp.microsecond // 1000:03d}"
-        checkpoint_dir = self.storage_dir / name
+        try:
+            name, checkpoint_dir = self._reserve_checkpoint_dir(timestamp)
+        except OSError as e:
+            return CheckpointResult(success=False, error=str(e))
         
         try:
-            checkpoint_dir.mkdir(parents=True, exist_ok=True)
-            
             # Collect files to archive
             files_to_archive = list(self._collect_files())
             if not files_to_archive:
+                checkpoint_dir.rmdir()
                 return CheckpointResult(
                     success=False,
                     error="No files to checkpoint"
@@ -131,11 +220,32 @@ class CheckpointStore:
             archive_path = checkpoint_dir / self.ARCHIVE_NAME
             total_size = 0
             
-            with tarfile.open(archive_path, "w:gz") as tar:
-                for file_path in files_to_archive:
-                    rel_path = file_path.relative_to(self.project_root)
-                    tar.add(file_path, arcname=str(rel_path))
-                    total_size += file_path.stat().st_size
+            # Level 1: most of the size win at a fraction of the default's CPU cost
+            tar_cm = tarfile.open(archive_path, "w:gz", compresslevel=1)
+            
+            workers = min(8, os.cpu_count() or 1)
+            with tar_cm as tar, ThreadPoolExecutor(max_workers=workers) as pool:
+                for (file_path, rel_path, st), data in self._read_ahead(pool, files_to_archive):
+                    if stat.S_ISREG(st.st_mode):
+                        # Same header tar.add would build, minus its lstat()
+                        info = tarfile.TarInfo(rel_path)
+                        info.size = st.st_size if data is None else len(data)
+                        info.mtime = st.st_mtime  # float: PAX keeps the sub-second part
+                        info.mode = stat.S_IMODE(st.st_mode)
+                        info.uid = st.st_uid
+                        info.gid = st.st_gid
+                        info.uname, info.gname = _owner_names(st.st_uid, st.st_gid)
+                        if data is not None:
+                            tar.addfile(info, io.BytesIO(data))
+                        else:
+                            with open(file_path, "rb") as f:
+                                tar.addfile(info, f)
+                    else:
+                        # Symlinks and other special files
+                        tar.add(file_path, arcname=rel_path, recursive=False)
+                    total_size += st.st_size
+            
+            transcript = transcript_hook(checkpoint_dir) if transcript_hook is not None else None
             
             # Save metadata
             metadata = CheckpointMetadata(
@@ -145,16 +255,19 @@ class CheckpointStore:
                 file_count=len(files_to_archive),
                 total_size=total_size,
                 session_id=session_id,
+                has_transcript=transcript is not None,
+                transcript=transcript,
             )
             
-            metadata_path = checkpoint_dir / self.METADATA_NAME
-            with open(metadata_path, "w") as f:
-                json.dump(metadata.to_dict(), f, indent=2)
+            metadata_dict = metadata.to_dict()
+            atomic_write(checkpoint_dir / self.METADATA_NAME, json.dumps(metadata_dict, indent=2))
+            self._update_index({name: metadata_dict})
             
             return CheckpointResult(
                 success=True,
                 name=name,
                 file_count=len(files_to_archive),
+                has_transcript=metadata.has_transcript,
             )
             
         except Exception as e:
@@ -163,6 +276,28 @@ class CheckpointStore:
                 shutil.rmtree(checkpoint_dir, ignore_errors=True)
             return CheckpointResult(success=False, error=str(e))
     
+    def _reserve_checkpoint_dir(self, timestamp: datetime) -> tuple[str, Path]:
+        """Create a new, uniquely named checkpoint directory.
+        
+        Names carry milliseconds for uniqueness when creating multiple
+        checkpoints quickly; on a collision the name is bumped by 1ms so it
+        still sorts after every earlier checkpoint.
+        
+        Args:
+            timestamp: Creation time the name is derived from
+            
+        Returns:
+            Tuple of (checkpoint name, created directory)
+        """
+        while True:
+            name = timestamp.strftime("%Y%m%d_%H%M%S") + f"_{timestamp.microsecond // 1000:03d}"
+            checkpoint_dir = self.storage_dir / name
+            try:
+                checkpoint_dir.mkdir(parents=True)
+                return name, checkpoint_dir
+            except FileExistsError:
+                timestamp += timedelta(milliseconds=1)
+    
     def restore(self, name: str, backup: bool = True) -> CheckpointResult:
         """Restore a checkpoint.
         
@@ -173,15 +308,20 @@ class CheckpointStore:
         Returns:
             CheckpointResult with success status
         """
-        checkpoint_dir = self.storage_dir / name
-        archive_path = checkpoint_dir / self.ARCHIVE_NAME
+        archive_path = self.find_archive(name)
         
-        if not archive_path.exists():
+        if archive_path is None:
             return CheckpointResult(
                 success=False,
                 error=f"Checkpoint not found: {name}"
             )
         
+        if archive_path.name == self.ZSTD_ARCHIVE_NAME and not _HAS_ZSTD:
+            return CheckpointResult(
+                success=False,
+                error=f"Checkpoint {name} is a zstd snapshot; restoring it needs Python 3.14+",
+            )
+        
         try:
             # Create backup if requested
             if backup:
@@ -194,23 +334,23 @@ class CheckpointStore:
                         error=f"Failed to create backup: {backup_result.error}"
                     )
             
-            # Extract to temp directory first
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                tmp_path = Path(tmp_dir)
-                
-                with tarfile.open(archive_path, "r:gz") as tar:
-                    tar.extractall(tmp_path, filter="data")
+            # Extract into a staging directory first, so a bad archive leaves the
+            # project untouched. It lives in the storage dir, which is normally on
+            # the project's filesystem: files are then moved into place, not copied.
+            with tempfile.TemporaryDirectory(dir=self.storage_dir, prefix=".restore-") as tmp_dir:
+                with tarfile.open(archive_path, "r:*") as tar:
+                    tar.extractall(tmp_dir, filter="data")
                 
-                # Copy files to project root
+                # Move files into the project root
                 file_count = 0
-                for root, _, files in os.walk(tmp_path):
+                for root, _, files in os.walk(tmp_dir):
+                    if not files:
+                        continue
+                    rel_root = os.path.relpath(root, tmp_dir)
+                    dst_root = self.project_root if rel_root == "." else self.project_root / rel_root
+                    dst_root.mkdir(parents=True, exist_ok=True)
                     for file in files:
-                        src = Path(root) / file
-                        rel_path = src.relative_to(tmp_path)
-                        dst = self.project_root / rel_path
-                        
-                        dst.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(src, dst)
+                        _move_file(os.path.join(root, file), dst_root / file)
                         file_count += 1
             
             return CheckpointResult(success=True, name=name, file_count=file_count)
@@ -218,40 +358,180 @@ class CheckpointStore:
         except Exception as e:
             return CheckpointResult(success=False, error=str(e))
     
-    def list(self) -> list[CheckpointMetadata]:
-        """List all checkpoints.
+    def find_archive(self, name: str) -> Path | None:
+        """Locate the snapshot archive of a checkpoint.
+        
+        Args:
+            name: Checkpoint name
+            
+        Returns:
+            Path to the archive, or None if the checkpoint has none
+        """
+        checkpoint_dir = self.storage_dir / name
+        for archive_name in self.ARCHIVE_NAMES:
+            archive_path = checkpoint_dir / archive_name
+            if archive_path.is_file():
+                return archive_path
+        return None
+    
+    def list(self, limit: int | None = None) -> list[CheckpointMetadata]:
+        """List checkpoints.
+        
+        Directory names are sorted first and metadata is only read for the
+        entries returned, so a small `limit` stays cheap on large stores.
+        Full listings are served from the metadata index when it is current.
         
+        Args:
+            limit: Maximum number of checkpoints to return (None for all)
+            
         Returns:
             List of checkpoint metadata, sorted by timestamp (newest first)
         """
-        checkpoints = []
+        checkpoints: list[CheckpointMetadata] = []
+        if limit is not None and limit <= 0:
+            return checkpoints
         
-        if not self.storage_dir.exists():
+        try:
+            with os.scandir(self.storage_dir) as it:
+                # Dot-directories are restore staging areas, not checkpoints
+                names = [entry.name for entry in it if entry.is_dir() and not entry.name.startswith(".")]
+        except OSError:
             return checkpoints
         
-        for entry in self.storage_dir.iterdir():
-            if not entry.is_dir():
+        # Sort by name (which is timestamp-based) descending
+        names.sort(reverse=True)
+        
+        if limit is None:
+            return self._list_all(names)
+        
+        for name in names:
+            cp = self._load_metadata(name)
+            if cp is None:
                 continue
+            checkpoints.append(cp)
+            if len(checkpoints) >= limit:
+                break
+        
+        return checkpoints
+    
+    def _list_all(self, names: list[str]) -> list[CheckpointMetadata]:
+        """Metadata for every checkpoint, served from the index when it is current.
+        
+        The index is current when it has an entry for exactly the checkpoint
+        directories present. Otherwise every metadata file is read (on a
+        thread pool for large stores) and the index is rebuilt.
+        
+        Args:
+            names: Checkpoint directory names, newest first
             
-            metadata_path = entry / self.METADATA_NAME
-            if metadata_path.exists():
-                try:
-                    with open(metadata_path) as f:
-                        data = json.load(f)
+        Returns:
+            List of checkpoint metadata in the order of `names`
+        """
+        entries = self._read_index()
+        if entries is not None and len(entries) == len(names) and all(n in entries for n in names):
+            checkpoints: list[CheckpointMetadata] = []
+            changes: dict[str, dict[str, Any] | None] = {}
+            for name in names:
+                data = entries[name]
+                if isinstance(data, dict):
                     checkpoints.append(CheckpointMetadata.from_dict(data))
-                except (OSError, json.JSONDecodeError):
-                    # Create minimal metadata from directory name
-                    checkpoints.append(CheckpointMetadata(
-                        name=entry.name,
-                        timestamp=entry.name,
-                        description="",
-                        file_count=0,
-                        total_size=0,
-                    ))
+                    continue
+                # No usable metadata when indexed: the file may have been written since
+                cp, data = self._scan_metadata(name)
+                if cp is not None:
+                    checkpoints.append(cp)
+                if data is not None:
+                    changes[name] = data
+            if changes:
+                self._update_index(changes)
+            return checkpoints
         
-        # Sort by name (which is timestamp-based) descending
-        checkpoints.sort(key=lambda x: x.name, reverse=True)
-        return checkpoints
+        if len(names) > _PARALLEL_LIST_MIN:
+            # The reads are independent
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                scanned = list(pool.map(self._scan_metadata, names))
+        else:
+            scanned = [self._scan_metadata(name) for name in names]
+        
+        self._write_index({name: data for name, (_, data) in zip(names, scanned)})
+        return [cp for cp, _ in scanned if cp is not None]
+    
+    def _load_metadata(self, name: str) -> CheckpointMetadata | None:
+        """Read a checkpoint's metadata for listing.
+        
+        Args:
+            name: Checkpoint directory name
+            
+        Returns:
+            CheckpointMetadata (minimal if unreadable), or None if the
+            directory has no metadata file
+        """
+        return self._scan_metadata(name)[0]
+    
+    def _scan_metadata(self, name: str) -> tuple[CheckpointMetadata | None, dict[str, Any] | None]:
+        """Read a checkpoint's metadata, along with the raw dict to index.
+        
+        Args:
+            name: Checkpoint directory name
+            
+        Returns:
+            Tuple of (metadata as from `_load_metadata`, parsed metadata
+            dict or None if missing or unreadable)
+        """
+        metadata_path = self.storage_dir / name / self.METADATA_NAME
+        try:
+            # Bytes straight to the parser: one read, no text decode layer
+            with open(metadata_path, "rb") as f:
+                data = json.loads(f.read())
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError):  # ValueError: JSONDecodeError / bad UTF-8
+            # Create minimal metadata from directory name
+            return CheckpointMetadata(
+                name=name,
+                timestamp=name,
+                description="",
+                file_count=0,
+                total_size=0,
+            ), None
+        return CheckpointMetadata.from_dict(data), data
+    
+    def _read_index(self) -> dict[str, Any] | None:
+        """Load the index entries (name -> metadata dict or None).
+        
+        Returns:
+            Entries, or None if the index is missing or unreadable
+        """
+        try:
+            with open(self.storage_dir / self.INDEX_NAME, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        entries = data.get("checkpoints") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else None
+    
+    def _write_index(self, entries: dict[str, Any]) -> None:
+        """Replace the index atomically (best-effort; list() can always rebuild it)."""
+        try:
+            atomic_write(self.storage_dir / self.INDEX_NAME, json.dumps({"version": 1, "checkpoints": entries}))
+        except OSError:
+            pass
+    
+    def _update_index(self, changes: dict[str, dict[str, Any] | None]) -> None:
+        """Apply metadata changes to an existing index.
+        
+        Args:
+            changes: Checkpoint name -> new metadata dict, or None to drop it
+        """
+        entries = self._read_index()
+        if entries is None:
+            return  # rebuilt by the next full list()
+        for name, data in changes.items():
+            if data is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = data
+        self._write_index(entries)
     
     def get(self, name: str) -> CheckpointMetadata | None:
         """Get metadata for a specific checkpoint.
@@ -263,13 +543,10 @@ class CheckpointStore:
             CheckpointMetadata or None if not found
         """
         metadata_path = self.storage_dir / name / self.METADATA_NAME
-        if not metadata_path.exists():
-            return None
-        
         try:
-            with open(metadata_path) as f:
-                return CheckpointMetadata.from_dict(json.load(f))
-        except (OSError, json.JSONDecodeError):
+            with open(metadata_path, "rb") as f:
+                return CheckpointMetadata.from_dict(json.loads(f.read()))
+        except (OSError, ValueError):
             return None
     
     def delete(self, name: str) -> bool:
@@ -281,6 +558,13 @@ class CheckpointStore:
         Returns:
             True if deleted successfully
         """
+        if not self._remove_checkpoint_dir(name):
+            return False
+        self._update_index({name: None})
+        return True
+    
+    def _remove_checkpoint_dir(self, name: str) -> bool:
+        """Remove a checkpoint directory, leaving the index untouched."""
         checkpoint_dir = self.storage_dir / name
         if not checkpoint_dir.exists():
             return False
@@ -305,12 +589,15 @@ class CheckpointStore:
             return 0
         
         to_delete = checkpoints[keep:]
-        deleted = 0
+        removed: dict[str, dict[str, Any] | None] = {}
         for cp in to_delete:
-            if self.delete(cp.name):
-                deleted += 1
+            if self._remove_checkpoint_dir(cp.name):
+                removed[cp.name] = None
         
-        return deleted
+        # One index rewrite for the whole batch
+        if removed:
+            self._update_index(removed)
+        return len(removed)
     
     def update_metadata(self, name: str, **updates) -> bool:
         """Update checkpoint metadata.
@@ -334,29 +621,76 @@ class CheckpointStore:
         # Save
         metadata_path = self.storage_dir / name / self.METADATA_NAME
         try:
-            with open(metadata_path, "w") as f:
-                json.dump(metadata.to_dict(), f, indent=2)
+            metadata_dict = metadata.to_dict()
+            atomic_write(metadata_path, json.dumps(metadata_dict, indent=2))
+            self._update_index({name: metadata_dict})
             return True
         except OSError:
             return False
     
-    def _collect_files(self) -> Iterator[Path]:
-        """Collect files to include in checkpoint.
+    @staticmethod
+    def _read_ahead(
+        pool: ThreadPoolExecutor,
+        files: list[tuple[str, str, os.stat_result]],
+    ) -> Iterator[tuple[tuple[str, str, os.stat_result], bytes | None]]:
+        """Read small regular files on `pool`, a bounded window ahead of the caller.
         
+        Args:
+            pool: Executor used for the reads
+            files: Entries from `_collect_files`
+            
         Yields:
-            Paths to files that should be checkpointed
+            Each entry, in order, with its contents (None if not prefetched)
         """
-        for root, dirs, files in os.walk(self.project_root):
-            root_path = Path(root)
-            rel_root = root_path.relative_to(self.project_root)
+        pending: deque[tuple[tuple[str, str, os.stat_result], Future[bytes] | None]] = deque()
+        for item in files:
+            st = item[2]
+            future = None
+            if stat.S_ISREG(st.st_mode) and st.st_size <= _MAX_PREFETCH_SIZE:
+                future = pool.submit(_read_file, item[0], st.st_size)
+            pending.append((item, future))
             
-            # Filter directories in-place to skip ignored ones
-            dirs[:] = [
-                d for d in dirs
-                if not self.ignore_config.should_ignore(str(rel_root / d))
-            ]
+            if len(pending) >= _READ_AHEAD:
+                done, future = pending.popleft()
+                yield done, future.result() if future else None
+        
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result() if future else None
+    
+    def _collect_files(self) -> Iterator[tuple[str, str, os.stat_result]]:
+        """Collect files to include in checkpoint.
+        
+        Yields:
+            Tuples of (absolute path, path relative to project root, lstat
+            result) for files that should be checkpointed
+        """
+        ignore = self.ignore_config
+        # (directory, path relative to project root, kept only by force_include)
+        stack: list[tuple[str, str, bool]] = [(str(self.project_root), "", False)]
+        while stack:
+            dir_path, rel_dir, forced = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
             
-            for file in files:
-                rel_path = rel_root / file
-                if not self.ignore_config.should_ignore(str(rel_path)):
-                    yield root_path / file
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if ignore.should_ignore_entry(name, rel_path, forced):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    yield entry.path, rel_path, st
+                elif not entry.is_symlink():
+                    # Like os.walk, symlinked directories are neither followed nor archived
+                    stack.append((entry.path, rel_path, forced or ignore.force_overrides(rel_path)))
@@ -5,17 +5,20 @@ Coordinates checkpoint store and context manager for unified operations.
 
 from __future__ import annotations
 
+import bisect
 import hashlib
 import json
 import os
+import time
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Callable, Literal, cast
 
 from ..config import ConfigLoader, RewindConfig, StorageMode
 from ..utils.env import get_global_rewind_dir, get_global_storage_dir
-from ..utils.fs import atomic_write, safe_json_load
+from ..utils.fs import atomic_write, cached_json_load, clone_file
 from .checkpoint_store import CheckpointStore, CheckpointMetadata
 from .transcript_manager import TranscriptCursor, TranscriptManager, TranscriptManagerError
 
@@ -23,6 +26,49 @@ from .transcript_manager import TranscriptCursor, TranscriptManager, TranscriptM
 RestoreMode = Literal["all", "code", "context"]
 TranscriptRestoreMode = Literal["fork", "in_place"]
 
+# Per transcript path: cursor offsets ascending, and for each prefix of that
+# order the checkpoint that comes first (newest) in the listing.
+BoundaryIndex = dict[str, tuple[list[int], list[CheckpointMetadata]]]
+
+# session.json fields that change on every hook call; updates touching only
+# these are appended to session-updates.jsonl instead of rewriting session.json.
+_SESSION_VOLATILE_FIELDS: frozenset[str] = frozenset(("updated_at", "updated_at_ns"))
+
+# Past this size the journal is folded back into session.json (only its tail is read).
+_SESSION_JOURNAL_MAX_BYTES = 4096
+
+
+def _cursor_from_dict(data: Any) -> TranscriptCursor | None:
+    """Build a TranscriptCursor from checkpoint metadata (None if malformed).
+
+    Values already of the expected JSON type are used as-is; anything else
+    goes through the legacy int()/str() coercion.
+    """
+    if not isinstance(data, dict):
+        return None
+    try:
+        offset = data.get("byte_offset_end", 0)
+        prefix = data.get("prefix_sha256", "")
+        tail = data.get("tail_sha256", "")
+        return TranscriptCursor(
+            byte_offset_end=offset if isinstance(offset, int) else int(offset),
+            last_event_id=data.get("last_event_id"),
+            prefix_sha256=prefix if isinstance(prefix, str) else str(prefix),
+            tail_sha256=tail if isinstance(tail, str) else str(tail),
+        )
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _expand_user_path(raw: str, home: str | None) -> Path:
+    return Path(raw).expanduser()
+
+
+def _resolve_user_path(raw: str) -> Path:
+    """`Path(raw).expanduser()`, memoized per raw string (and $HOME)."""
+    return _expand_user_path(raw, os.environ.get("HOME"))
+
 
 @dataclass
 class RewindStatus:
@@ -49,7 +95,17 @@ class RewindController:
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self._config_loader = ConfigLoader(project_root=self.project_root)
         self._store: CheckpointStore | None = None
-        self._transcripts: TranscriptManager = TranscriptManager()
+        self._transcripts_inst: TranscriptManager | None = None
+        # Derived paths, computed on first use; reset by init() when the mode changes.
+        self._rewind_dir_cache: Path | None = None
+        self._checkpoints_dir_cache: Path | None = None
+        self._session_file_cache: Path | None = None
+        self._session_updates_file_cache: Path | None = None
+        self._project_hash_cache: str | None = None
+        self._boundary_index_cache: tuple[tuple[str, ...], BoundaryIndex] | None = None
+        # Full listing, reused until this controller changes the store.
+        self._checkpoints_cache: list[CheckpointMetadata] | None = None
+        self._session_update_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
     
     @property
     def config(self) -> RewindConfig:
@@ -67,15 +123,25 @@ class RewindController:
             )
         return self._store
     
+    @property
+    def _transcripts(self) -> TranscriptManager:
+        """Get transcript manager (lazy init; most commands never touch transcripts)."""
+        if self._transcripts_inst is None:
+            self._transcripts_inst = TranscriptManager()
+        return self._transcripts_inst
+    
     def get_rewind_dir(self) -> Path:
         """Get the .agent/rewind directory path.
         
         Returns:
             Path to .agent/rewind directory (project-local or global)
         """
-        if self.config.storage_mode == StorageMode.GLOBAL:
-            return get_global_rewind_dir()
-        return self.project_root / ".agent" / "rewind"
+        if self._rewind_dir_cache is None:
+            if self.config.storage_mode == StorageMode.GLOBAL:
+                self._rewind_dir_cache = get_global_rewind_dir()
+            else:
+                self._rewind_dir_cache = self.project_root / ".agent" / "rewind"
+        return self._rewind_dir_cache
     
     def get_checkpoints_dir(self) -> Path:
         """Get the checkpoints storage directory.
@@ -83,20 +149,70 @@ class RewindController:
         Returns:
             Path to checkpoints directory
         """
-        if self.config.storage_mode == StorageMode.GLOBAL:
-            # Use project hash for global storage
-            project_hash = self._get_project_hash()
-            return get_global_storage_dir() / project_hash / "checkpoints"
-        return self.get_rewind_dir() / "checkpoints"
+        if self._checkpoints_dir_cache is None:
+            if self.config.storage_mode == StorageMode.GLOBAL:
+                # Use project hash for global storage
+                project_hash = self._get_project_hash()
+                self._checkpoints_dir_cache = get_global_storage_dir() / project_hash / "checkpoints"
+            else:
+                self._checkpoints_dir_cache = self.get_rewind_dir() / "checkpoints"
+        return self._checkpoints_dir_cache
 
     def get_session_file(self) -> Path:
         """Get path to stored session metadata for this project."""
-        return self.get_rewind_dir() / "session.json"
+        if self._session_file_cache is None:
+            self._session_file_cache = self.get_rewind_dir() / "session.json"
+        return self._session_file_cache
+
+    def _get_session_updates_file(self) -> Path:
+        if self._session_updates_file_cache is None:
+            self._session_updates_file_cache = self.get_rewind_dir() / "session-updates.jsonl"
+        return self._session_updates_file_cache
+
+    def _get_transcript_backup_dir(self) -> Path:
+        return self.get_rewind_dir() / "transcript-backup"
+
+    def load_session_info(self) -> dict[str, Any]:
+        """Load stored session info (best-effort; empty dict if missing or invalid).
+        
+        The newest line of `session-updates.jsonl`, if any, is applied over
+        `session.json`. Parsed files are reused until their mtime or size
+        changes, so the returned dict must be treated as read-only.
+        """
+        data = cached_json_load(self.get_session_file(), None)
+        if not isinstance(data, dict):
+            return {}
+        update = self._load_session_update()
+        return {**data, **update} if update else data
+
+    def _load_session_update(self) -> dict[str, Any] | None:
+        """Read the last entry of the session update journal (None if absent)."""
+        updates_path = self._get_session_updates_file()
+        try:
+            st = os.stat(updates_path)
+        except OSError:
+            self._session_update_cache = None
+            return None
 
-    def load_session_info(self) -> dict[str, Any] | None:
-        """Load stored session info (best-effort)."""
-        data = safe_json_load(self.get_session_file(), None)
-        return data if isinstance(data, dict) else None
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._session_update_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        update: dict[str, Any] = {}
+        try:
+            with open(updates_path, "rb") as f:
+                # Entries are tiny; the last one is well within the final 4 KiB.
+                f.seek(max(0, st.st_size - 4096))
+                lines = f.read().splitlines()
+            if lines:
+                entry = json.loads(lines[-1])
+                if isinstance(entry, dict):
+                    update = {k: v for k, v in entry.items() if k in _SESSION_VOLATILE_FIELDS}
+        except (OSError, ValueError):
+            pass
+        self._session_update_cache = (signature, update)
+        return update
 
     def save_session_info(
         self,
@@ -107,18 +223,40 @@ class RewindController:
         env_file: str | None = None,
     ) -> None:
         """Persist session info to disk (best-effort)."""
+        now_ns = time.time_ns()
         info: dict[str, Any] = {
             "version": 1,
             "transcript_path": transcript_path or "",
             "session_id": session_id or "",
             "agent": agent or "unknown",
             "project_root": str(self.project_root),
-            "updated_at": datetime.now().isoformat(),
+            "updated_at": datetime.fromtimestamp(now_ns / 1e9).isoformat(),
+            "updated_at_ns": now_ns,
         }
         if env_file:
             info["env_file"] = env_file
 
         try:
+            current = self.load_session_info()
+            if current.keys() == info.keys() and all(
+                current[k] == v for k, v in info.items() if k not in _SESSION_VOLATILE_FIELDS
+            ):
+                # Same session: append the new timestamps, leave session.json alone.
+                update = {k: info[k] for k in _SESSION_VOLATILE_FIELDS}
+                line = (json.dumps(update, separators=(",", ":")) + "\n").encode()
+                fd = os.open(self._get_session_updates_file(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    if os.fstat(fd).st_size < _SESSION_JOURNAL_MAX_BYTES:
+                        os.write(fd, line)
+                        return
+                finally:
+                    os.close(fd)
+
+            # New session or a full journal: start the journal over, then rewrite session.json.
+            try:
+                os.unlink(self._get_session_updates_file())
+            except FileNotFoundError:
+                pass
             atomic_write(self.get_session_file(), json.dumps(info, indent=2), mode="w")
         except Exception:
             # Best-effort; do not fail core operations.
@@ -145,6 +283,11 @@ class RewindController:
                 self._config_loader.reload()
                 # Reset lazy-loaded components
                 self._store = None
+                self._checkpoints_cache = None
+                self._rewind_dir_cache = None
+                self._checkpoints_dir_cache = None
+                self._session_file_cache = None
+                self._session_updates_file_cache = None
             
             # Create checkpoints directory
             self.get_checkpoints_dir().mkdir(parents=True, exist_ok=True)
@@ -182,8 +325,28 @@ class RewindController:
             if not init_result.get("success"):
                 return init_result
         
+        # Transcript snapshot (source-of-truth conversation), written by the store
+        # into the new checkpoint before its metadata so that is written once.
+        effective_transcript_path = transcript_path
+        session_info: dict[str, Any] = {}
+        if not effective_transcript_path:
+            session_info = self.load_session_info()
+            effective_transcript_path = session_info.get("transcript_path")
+
+        transcript_hook: Callable[[Path], dict[str, Any] | None] | None = None
+        if effective_transcript_path:
+            tp = _resolve_user_path(effective_transcript_path)
+            agent_hint = session_info.get("agent")
+            agent_hint = str(agent_hint) if isinstance(agent_hint, str) and agent_hint else None
+            transcript_hook = partial(self._snapshot_transcript, tp, agent_hint=agent_hint, force=force)
+
         # Create checkpoint
-        result = self.store.create(description=description, session_id=session_id)
+        result = self.store.create(
+            description=description,
+            session_id=session_id,
+            transcript_hook=transcript_hook,
+        )
+        self._checkpoints_cache = None
         
         if not result.success:
             return {
@@ -191,57 +354,93 @@ class RewindController:
                 "error": result.error,
             }
         
-        checkpoint_dir = self.get_checkpoints_dir() / result.name
-
-        # Save transcript snapshot (source-of-truth conversation)
-        effective_transcript_path = transcript_path
-        session_info: dict[str, Any] = {}
-        if not effective_transcript_path:
-            session_info = self.load_session_info() or {}
-            if isinstance(session_info, dict):
-                effective_transcript_path = session_info.get("transcript_path")
-
-        has_transcript = False
-        forkable_transcript: dict[str, Any] | None = None
-        if effective_transcript_path:
-            tp = Path(effective_transcript_path).expanduser()
-            if tp.exists():
-                try:
-                    agent_hint = session_info.get("agent") if isinstance(session_info, dict) else None
-                    snapshot = self._transcripts.snapshot_into_checkpoint(
-                        tp,
-                        checkpoint_dir,
-                        agent_hint=str(agent_hint) if isinstance(agent_hint, str) and agent_hint else None,
-                    )
-                    has_transcript = True
-                    forkable_transcript = {
-                        "agent": snapshot.agent,
-                        "original_path": snapshot.original_path,
-                        "snapshot": snapshot.snapshot_relpath,
-                        "cursor": {
-                            "byte_offset_end": snapshot.cursor.byte_offset_end,
-                            "last_event_id": snapshot.cursor.last_event_id,
-                            "prefix_sha256": snapshot.cursor.prefix_sha256,
-                            "tail_sha256": snapshot.cursor.tail_sha256,
-                        },
-                    }
-                except TranscriptManagerError:
-                    has_transcript = False
-
-        if has_transcript:
-            self.store.update_metadata(
-                result.name,
-                has_transcript=True,
-                transcript=forkable_transcript,
-            )
-        
         return {
             "success": True,
             "name": result.name,
             "fileCount": result.file_count,
-            "hasTranscript": has_transcript,
+            "hasTranscript": result.has_transcript,
+        }
+
+    def _snapshot_transcript(
+        self,
+        tp: Path,
+        checkpoint_dir: Path,
+        *,
+        agent_hint: str | None,
+        force: bool,
+    ) -> dict[str, Any] | None:
+        """Snapshot the transcript into a checkpoint being created.
+        
+        Args:
+            tp: Resolved transcript path
+            checkpoint_dir: Directory of the checkpoint being created
+            agent_hint: Agent kind from session info, if known
+            force: Always write a fresh snapshot
+            
+        Returns:
+            Transcript metadata for the checkpoint, or None if there is none
+        """
+        if not tp.exists():
+            return None
+
+        if not force:
+            # Nothing new in the transcript: share the previous snapshot.
+            reused = self._reuse_transcript_snapshot(tp, checkpoint_dir)
+            if reused is not None:
+                return reused
+
+        try:
+            snapshot = self._transcripts.snapshot_into_checkpoint(tp, checkpoint_dir, agent_hint=agent_hint)
+        except TranscriptManagerError:
+            return None
+
+        return {
+            "agent": snapshot.agent,
+            "original_path": snapshot.original_path,
+            "snapshot": snapshot.snapshot_relpath,
+            "cursor": {
+                "byte_offset_end": snapshot.cursor.byte_offset_end,
+                "last_event_id": snapshot.cursor.last_event_id,
+                "prefix_sha256": snapshot.cursor.prefix_sha256,
+                "tail_sha256": snapshot.cursor.tail_sha256,
+            },
         }
     
+    def _reuse_transcript_snapshot(self, tp: Path, checkpoint_dir: Path) -> dict[str, Any] | None:
+        """Link the previous checkpoint's transcript snapshot if the transcript is unchanged.
+        
+        Args:
+            tp: Resolved transcript path
+            checkpoint_dir: Directory of the checkpoint being created
+            
+        Returns:
+            Transcript metadata for the new checkpoint, or None to snapshot normally
+        """
+        previous = next((cp for cp in self.head_checkpoints(2) if cp.name != checkpoint_dir.name), None)
+        meta = previous.transcript if previous is not None else None
+        if not isinstance(meta, dict) or meta.get("original_path") != str(tp):
+            return None
+
+        snapshot_rel = meta.get("snapshot")
+        if not isinstance(snapshot_rel, str) or not snapshot_rel or os.path.basename(snapshot_rel) != snapshot_rel:
+            return None
+        cursor = _cursor_from_dict(meta.get("cursor"))
+        if cursor is None or not self._transcripts.matches_cursor(tp, cursor):
+            return None
+
+        # Snapshots are written once and never modified, so a hardlink is safe.
+        src = checkpoint_dir.parent / previous.name / snapshot_rel
+        dst = checkpoint_dir / snapshot_rel
+        try:
+            try:
+                os.link(src, dst)
+            except OSError:
+                clone_file(src, dst)
+        except OSError:
+            return None
+
+        return {**meta, "reuses": previous.name}
+
     def restore(
         self,
         name: str,
@@ -260,7 +459,9 @@ class RewindController:
             Result dictionary
         """
         checkpoint_dir = self.get_checkpoints_dir() / name
-        if not checkpoint_dir.exists():
+        try:
+            os.stat(checkpoint_dir)
+        except OSError:
             return {"success": False, "error": f"Checkpoint not found: {name}"}
         
         results = {"success": True, "name": name}
@@ -268,6 +469,7 @@ class RewindController:
         # Restore code
         if mode in ("all", "code"):
             code_result = self.store.restore(name, backup=not skip_backup)
+            self._checkpoints_cache = None  # The backup is a new checkpoint
             if not code_result.success:
                 return {"success": False, "error": code_result.error}
             results["codeRestored"] = True
@@ -297,13 +499,13 @@ class RewindController:
         if n <= 0:
             return {"success": False, "error": "n must be >= 1"}
 
-        session_info = self.load_session_info() or {}
+        session_info = self.load_session_info()
         transcript_path: str | None = None
 
         env_tp = os.environ.get("REWIND_TRANSCRIPT_PATH")
         if isinstance(env_tp, str) and env_tp.strip():
             transcript_path = env_tp.strip()
-        elif isinstance(session_info, dict):
+        else:
             transcript_path = session_info.get("transcript_path")
 
         if not transcript_path:
@@ -312,15 +514,18 @@ class RewindController:
                 "error": "No transcript path available (run inside an agent session or ensure hooks wrote session.json)",
             }
 
-        agent = session_info.get("agent") if isinstance(session_info, dict) else None
+        agent = session_info.get("agent")
         agent_str = str(agent) if isinstance(agent, str) and agent else None
 
-        tp = Path(transcript_path).expanduser()
-        if not tp.exists():
+        tp = _resolve_user_path(transcript_path)
+        try:
+            # One stat answers both "does it exist" and the size the scan needs.
+            tp_size = os.stat(tp).st_size
+        except OSError:
             return {"success": False, "error": f"Transcript not found: {tp}"}
 
         try:
-            boundary = cast(Any, self._transcripts).find_boundary_by_user_prompts(tp, n)
+            boundary = cast(Any, self._transcripts).find_boundary_by_user_prompts(tp, n, file_size=tp_size)
         except (TranscriptManagerError, ValueError) as e:
             return {"success": False, "error": str(e)}
 
@@ -332,10 +537,12 @@ class RewindController:
         }
 
         if both:
+            checkpoints = self.list_checkpoints()
             checkpoint = self._select_checkpoint_for_boundary(
-                self.list_checkpoints(),
+                checkpoints,
                 transcript_path=str(tp),
                 boundary_offset=boundary.boundary_offset,
+                index=self._boundary_index(checkpoints),
             )
             if checkpoint is not None:
                 code_restore = self.restore(name=checkpoint.name, mode="code", skip_backup=False)
@@ -348,7 +555,7 @@ class RewindController:
                 result["note"] = "No code checkpoint matched this rewind boundary; created chat rewind only"
 
         if in_place:
-            backup_dir = self.get_rewind_dir() / "transcript-backup"
+            backup_dir = self._get_transcript_backup_dir()
             try:
                 backup_path = cast(Any, self._transcripts).rewrite_in_place_at_offset(
                     current_transcript_path=tp,
@@ -386,17 +593,22 @@ class RewindController:
         )
         return result
 
+    def _boundary_index(self, checkpoints: list[CheckpointMetadata]) -> BoundaryIndex:
+        """Get the boundary index for `checkpoints`, reused while the names are unchanged."""
+        token = tuple(cp.name for cp in checkpoints)
+        cached = self._boundary_index_cache
+        if cached is not None and cached[0] == token:
+            return cached[1]
+        index = self._build_boundary_index(checkpoints)
+        self._boundary_index_cache = (token, index)
+        return index
+
     @staticmethod
-    def _select_checkpoint_for_boundary(
-        checkpoints: list[CheckpointMetadata],
-        *,
-        transcript_path: str,
-        boundary_offset: int,
-    ) -> CheckpointMetadata | None:
-        """Pick the newest checkpoint whose cursor is at-or-before the boundary."""
-        tp = str(Path(transcript_path).expanduser())
+    def _build_boundary_index(checkpoints: list[CheckpointMetadata]) -> BoundaryIndex:
+        """Group checkpoints by transcript path, sorted by cursor offset."""
+        groups: dict[str, list[tuple[int, int, CheckpointMetadata]]] = {}
 
-        for cp in checkpoints:
+        for position, cp in enumerate(checkpoints):
             meta = cp.transcript
             if not isinstance(meta, dict):
                 continue
@@ -405,22 +617,65 @@ class RewindController:
             if not isinstance(original_path, str) or not original_path:
                 continue
 
-            if str(Path(original_path).expanduser()) != tp:
-                continue
+            key = str(_resolve_user_path(original_path))
 
             cursor = meta.get("cursor")
             if not isinstance(cursor, dict):
                 continue
 
-            try:
-                cursor_end = int(cursor.get("byte_offset_end", 0))
-            except Exception:
-                continue
+            cursor_end = cursor.get("byte_offset_end", 0)
+            if not isinstance(cursor_end, int):
+                try:
+                    cursor_end = int(cursor_end)
+                except Exception:
+                    continue
+
+            groups.setdefault(key, []).append((cursor_end, position, cp))
+
+        index: BoundaryIndex = {}
+        for key, entries in groups.items():
+            entries.sort(key=lambda e: e[0])
+            offsets: list[int] = []
+            newest: list[CheckpointMetadata] = []
+            best_position = -1
+            best: CheckpointMetadata | None = None
+            for cursor_end, position, cp in entries:
+                if best is None or position < best_position:
+                    best_position, best = position, cp
+                offsets.append(cursor_end)
+                newest.append(best)
+            index[key] = (offsets, newest)
+        return index
 
-            if cursor_end <= boundary_offset:
-                return cp
+    @staticmethod
+    def _select_checkpoint_for_boundary(
+        checkpoints: list[CheckpointMetadata],
+        *,
+        transcript_path: str,
+        boundary_offset: int,
+        index: BoundaryIndex | None = None,
+    ) -> CheckpointMetadata | None:
+        """Pick the newest checkpoint whose cursor is at-or-before the boundary.
+        
+        Args:
+            checkpoints: Checkpoints, newest first
+            transcript_path: Transcript the checkpoint must belong to
+            boundary_offset: Byte offset of the rewind boundary
+            index: Prebuilt `_build_boundary_index(checkpoints)`, if available
+            
+        Returns:
+            Matching checkpoint or None
+        """
+        if index is None:
+            index = RewindController._build_boundary_index(checkpoints)
 
-        return None
+        entry = index.get(str(_resolve_user_path(transcript_path)))
+        if entry is None:
+            return None
+
+        offsets, newest = entry
+        count = bisect.bisect_right(offsets, boundary_offset)
+        return newest[count - 1] if count else None
 
     def _restore_transcript(self, checkpoint_dir: Path, transcript_restore: TranscriptRestoreMode) -> dict[str, Any]:
         """Restore conversation state from a checkpoint.
@@ -428,36 +683,23 @@ class RewindController:
         Default is to create a new fork session file and not mutate the original transcript.
         """
         meta = self.store.get(checkpoint_dir.name)
-        if not meta or not meta.transcript:
+        if not meta or not meta.transcript or not isinstance(meta.transcript, dict):
             return {"contextRestored": False}
 
         transcript_meta = meta.transcript
-        cursor_data = transcript_meta.get("cursor") if isinstance(transcript_meta, dict) else None
-        if not isinstance(cursor_data, dict):
-            return {"contextRestored": False}
-
-        try:
-            cursor = TranscriptCursor(
-                byte_offset_end=int(cursor_data.get("byte_offset_end", 0)),
-                last_event_id=cursor_data.get("last_event_id"),
-                prefix_sha256=str(cursor_data.get("prefix_sha256", "")),
-                tail_sha256=str(cursor_data.get("tail_sha256", "")),
-            )
-        except Exception:
+        cursor = _cursor_from_dict(transcript_meta.get("cursor"))
+        if cursor is None:
             return {"contextRestored": False}
 
         # Resolve current transcript path (prefer session.json)
-        current_path: str | None = None
-        session_info = self.load_session_info() or {}
-        if isinstance(session_info, dict):
-            current_path = session_info.get("transcript_path")
+        current_path: str | None = self.load_session_info().get("transcript_path")
         if not current_path:
             current_path = transcript_meta.get("original_path") or transcript_meta.get("path")
 
         if not current_path:
             return {"contextRestored": False}
 
-        current_transcript_path = Path(current_path).expanduser()
+        current_transcript_path = _resolve_user_path(current_path)
         snapshot_rel = transcript_meta.get("snapshot")
         snapshot_gz = (checkpoint_dir / snapshot_rel) if isinstance(snapshot_rel, str) else None
         if snapshot_gz is not None and not snapshot_gz.exists():
@@ -465,7 +707,7 @@ class RewindController:
 
         if transcript_restore == "fork":
             try:
-                agent = transcript_meta.get("agent") if isinstance(transcript_meta, dict) else None
+                agent = transcript_meta.get("agent")
                 fork_path = self._transcripts.create_fork_session(
                     checkpoint_cursor=cursor,
                     checkpoint_snapshot_gz=snapshot_gz,
@@ -477,7 +719,7 @@ class RewindController:
                 return {"contextRestored": False, "contextError": str(e)}
 
             self._append_restore_history({
-                "timestamp": datetime.now().isoformat(),
+                "timestamp_ns": time.time_ns(),
                 "checkpoint": checkpoint_dir.name,
                 "transcript": {
                     "mode": "fork",
@@ -498,7 +740,7 @@ class RewindController:
             return {"contextRestored": False, "contextError": str(e)}
 
         self._append_restore_history({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "checkpoint": checkpoint_dir.name,
             "transcript": {
                 "mode": "in_place",
@@ -515,14 +757,19 @@ class RewindController:
         current_transcript_path: Path,
     ) -> None:
         # Backup current transcript first.
-        backup_dir = self.get_rewind_dir() / "transcript-backup"
+        backup_dir = self._get_transcript_backup_dir()
         backup_dir.mkdir(parents=True, exist_ok=True)
         backup_path = backup_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
-        if current_transcript_path.exists():
-            import shutil
-            shutil.copy2(current_transcript_path, backup_path)
-
-        if current_transcript_path.exists() and self._transcripts.prefix_matches(
+        try:
+            os.stat(current_transcript_path)
+            current_exists = True
+        except OSError:
+            current_exists = False
+        if current_exists:
+            # A clone, not a hardlink: the truncate below must not reach the backup.
+            clone_file(current_transcript_path, backup_path)
+
+        if current_exists and self._transcripts.prefix_matches(
             current_transcript_path, checkpoint_cursor.prefix_sha256
         ):
             try:
@@ -539,14 +786,18 @@ class RewindController:
         self._transcripts._inflate_gz(checkpoint_snapshot_gz, current_transcript_path)
 
     def _append_restore_history(self, entry: dict[str, Any]) -> None:
-        """Append an entry to restore history (best-effort)."""
-        history_path = self.get_rewind_dir() / "restore-history.json"
-        history = safe_json_load(history_path, [])
-        if not isinstance(history, list):
-            history = []
-        history.append(entry)
+        """Append an entry to restore history (best-effort).
+        
+        History is newline-delimited JSON, one entry per line, so a restore
+        appends a single line instead of rewriting the whole file. A legacy
+        `restore-history.json` is left untouched.
+        """
+        history_path = self.get_rewind_dir() / "restore-history.jsonl"
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
         try:
-            atomic_write(history_path, json.dumps(history, indent=2), mode="w")
+            history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(history_path, "a", encoding="utf-8") as f:
+                f.write(line)
         except Exception:
             return
     
@@ -556,7 +807,7 @@ class RewindController:
         Returns:
             Result dictionary
         """
-        checkpoints = self.list_checkpoints()
+        checkpoints = self.head_checkpoints(2)
         if len(checkpoints) < 2:
             return {"success": False, "error": "Not enough checkpoints to undo"}
         
@@ -567,6 +818,7 @@ class RewindController:
         if result.get("success"):
             # Delete the most recent checkpoint
             self.store.delete(checkpoints[0].name)
+            self._checkpoints_cache = None
             result["deletedCheckpoint"] = checkpoints[0].name
         
         return result
@@ -574,10 +826,42 @@ class RewindController:
     def list_checkpoints(self) -> list[CheckpointMetadata]:
         """List all checkpoints.
         
+        The listing is cached until this controller creates, restores or
+        deletes a checkpoint; changes made through `store` directly or by
+        other processes are not seen.
+        
         Returns:
             List of checkpoint metadata, newest first
         """
-        return self.store.list()
+        if self._checkpoints_cache is None:
+            self._checkpoints_cache = self.store.list()
+        return list(self._checkpoints_cache)
+    
+    def head_checkpoints(self, k: int) -> list[CheckpointMetadata]:
+        """List only the `k` most recent checkpoints.
+        
+        Args:
+            k: Number of checkpoints to return
+            
+        Returns:
+            Up to `k` checkpoint metadata entries, newest first
+        """
+        if self._checkpoints_cache is not None:
+            return self._checkpoints_cache[:max(k, 0)]
+        return self.store.list(limit=k)
+    
+    def get_checkpoint(self, name: str) -> CheckpointMetadata | None:
+        """Look up one checkpoint by exact name without listing the store.
+        
+        Args:
+            name: Checkpoint name
+            
+        Returns:
+            CheckpointMetadata or None if not found
+        """
+        if not name or name in {".", ".."} or "/" in name or os.sep in name:
+            return None
+        return self.store.get(name)
     
     def get_status(self) -> RewindStatus:
         """Get system status.
@@ -592,9 +876,9 @@ class RewindController:
         latest = checkpoints[0].name if checkpoints else None
         
         agent = "unknown"
-        session_info = self.load_session_info() or {}
-        if isinstance(session_info, dict) and session_info.get("agent"):
-            agent = str(session_info.get("agent"))
+        session_agent = self.load_session_info().get("agent")
+        if session_agent:
+            agent = str(session_agent)
         
         return RewindStatus(
             initialized=initialized,
@@ -623,12 +907,24 @@ class RewindController:
         if not checkpoints_dir.exists():
             issues.append("Checkpoints directory missing")
         
-        # Check for corrupted checkpoints
-        for cp in self.list_checkpoints():
-            cp_dir = checkpoints_dir / cp.name
-            archive = cp_dir / "snapshot.tar.gz"
-            if not archive.exists():
-                issues.append(f"Checkpoint {cp.name} missing archive")
+        # Check for corrupted checkpoints: one listing per checkpoint dir, no metadata parsing
+        corrupted: list[str] = []
+        try:
+            with os.scandir(checkpoints_dir) as it:
+                # Dot-directories are restore staging areas, not checkpoints
+                entries = [e for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")]
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                with os.scandir(entry.path) as cp_it:
+                    names = {e.name for e in cp_it}
+            except OSError:
+                continue
+            if CheckpointStore.METADATA_NAME in names and names.isdisjoint(CheckpointStore.ARCHIVE_NAMES):
+                corrupted.append(entry.name)
+        corrupted.sort(reverse=True)
+        issues.extend(f"Checkpoint {name} missing archive" for name in corrupted)
         
         return {
             "valid": len(issues) == 0,
@@ -677,5 +973,8 @@ class RewindController:
         Returns:
             Short hash string
         """
-        path_bytes = str(self.project_root.resolve()).encode()
-        return hashlib.sha256(path_bytes).hexdigest()[:12]
+        # The project root is fixed for the controller's lifetime.
+        if self._project_hash_cache is None:
+            path_bytes = str(self.project_root.resolve()).encode()
+            self._project_hash_cache = hashlib.sha256(path_bytes).hexdigest()[:12]
+        return self._project_hash_cache
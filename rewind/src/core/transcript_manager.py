@@ -14,20 +14,107 @@ from __future__ import annotations
 
 import gzip
 import hashlib
+import io
 import json
+import mmap
 import os
 import re
+import shutil
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from ..integrations.agents.registry import AgentRegistry
+from ..utils.fs import clone_file, kernel_copy
 
 
 AgentKind = str
 
+# Raw-line prefilter for detect_agent's sniff: a dict carrying any of the
+# id keys it looks for must contain one of these byte strings.
+_SNIFF_KEYS: tuple[bytes, ...] = (b'"uuid"', b'"parentUuid"', b'"id"', b'"parentId"')
+
+# json.dumps(obj, ensure_ascii=False) without building a new encoder per call.
+_dumps_unicode = json.JSONEncoder(ensure_ascii=False).encode
+
+_HAS_PREAD = hasattr(os, "pread")  # Not on Windows
+
+# find_boundary_by_user_prompts reads the transcript backwards in windows of this size.
+_SCAN_WINDOW_BYTES = 1024 * 1024
+
+
+def _pread(f, size: int, offset: int) -> bytes:
+    """Read `size` bytes at `offset` of an open binary file.
+
+    A single pread(2) where available (it neither moves nor uses the file
+    position); seek + read elsewhere.
+    """
+    if _HAS_PREAD:
+        return os.pread(f.fileno(), size, offset)
+    f.seek(offset)
+    return f.read(size)
+
+
+@lru_cache(maxsize=1)
+def _bundled_registry() -> AgentRegistry:
+    return AgentRegistry.load_bundled()
+
+
+@dataclass(frozen=True, slots=True)
+class _TranscriptSettings:
+    """Per-profile transcript settings of a registry (agent ids lowercased)."""
+
+    path_matchers: tuple[tuple[str, re.Pattern[str]], ...]
+    title_prefix_agents: frozenset[str]
+    last_event_id_fields: dict[str, list[str]]
+
+
+@lru_cache(maxsize=1)
+def _bundled_transcript_settings() -> _TranscriptSettings:
+    """Extract the bundled profiles' transcript settings once per process."""
+    path_matchers: list[tuple[str, re.Pattern[str]]] = []
+    title_prefix_agents: set[str] = set()
+    last_event_id_fields: dict[str, list[str]] = {}
+    seen: set[str] = set()
+    for profile in _bundled_registry().all():
+        agent_key = profile.id.lower()
+        # Lookups by id resolve to the first profile with that id.
+        first = agent_key not in seen
+        seen.add(agent_key)
+        transcript = profile.data.get("transcript") if isinstance(profile.data, dict) else None
+        if not isinstance(transcript, dict):
+            continue
+
+        regexes = transcript.get("path_regexes")
+        if isinstance(regexes, list):
+            for pat in regexes:
+                if isinstance(pat, str) and pat:
+                    try:
+                        path_matchers.append((profile.id, re.compile(pat)))
+                    except re.error:
+                        continue
+
+        if not first:
+            continue
+
+        tp = transcript.get("title_prefix")
+        if isinstance(tp, dict) and tp.get("enabled") is not False and tp.get("json_path", "$.title") == "$.title":
+            title_prefix_agents.add(agent_key)
+
+        fields = transcript.get("last_event_id_fields")
+        if isinstance(fields, list) and all(isinstance(x, str) for x in fields):
+            last_event_id_fields[agent_key] = [str(x) for x in fields]
+
+    return _TranscriptSettings(
+        path_matchers=tuple(path_matchers),
+        title_prefix_agents=frozenset(title_prefix_agents),
+        last_event_id_fields=last_event_id_fields,
+    )
+
 
 @dataclass(frozen=True, slots=True)
 class TranscriptCursor:
@@ -66,39 +153,30 @@ class TranscriptManager:
 
     PREFIX_HASH_BYTES = 64 * 1024
     TAIL_HASH_BYTES = 64 * 1024
+    HASH_CACHE_SIZE = 256
 
     def __init__(self) -> None:
-        self._registry = AgentRegistry.load_bundled()
+        self._registry = _bundled_registry()
+        # (path, inode, size, mtime_ns) -> (prefix_sha256, tail_sha256), LRU order
+        self._hash_cache: OrderedDict[tuple[str, int, int, int], tuple[str, str]] = OrderedDict()
+
+        # Shared per process; treat as read-only.
+        settings = _bundled_transcript_settings()
+        self._path_matchers = settings.path_matchers
+        self._title_prefix_agents = settings.title_prefix_agents
+        self._last_event_id_fields = settings.last_event_id_fields
 
     def _title_prefix_enabled(self, agent: str | None) -> bool:
         if not agent:
             return False
-        profile = self._registry.get(agent)
-        if not profile:
-            return False
-        transcript = profile.data.get("transcript") if isinstance(profile.data, dict) else None
-        if not isinstance(transcript, dict):
-            return False
-        tp = transcript.get("title_prefix")
-        if not isinstance(tp, dict):
-            return False
-        if tp.get("enabled") is False:
-            return False
-        return tp.get("json_path", "$.title") == "$.title"
+        return agent.strip().lower() in self._title_prefix_agents
 
     def detect_agent(self, transcript_path: Path) -> AgentKind:
         p = str(transcript_path)
 
-        for profile in self._registry.all():
-            transcript = profile.data.get("transcript") if isinstance(profile.data, dict) else None
-            if not isinstance(transcript, dict):
-                continue
-            regexes = transcript.get("path_regexes")
-            if not isinstance(regexes, list):
-                continue
-            for pat in regexes:
-                if isinstance(pat, str) and pat and re.search(pat, p):
-                    return profile.id
+        for agent_id, regex in self._path_matchers:
+            if regex.search(p):
+                return agent_id
 
         # Best-effort sniff from first non-empty JSON line
         try:
@@ -108,7 +186,7 @@ class TranscriptManager:
                     if not line:
                         break
                     line = line.strip()
-                    if not line:
+                    if not line or not any(key in line for key in _SNIFF_KEYS):
                         continue
                     try:
                         obj = json.loads(line)
@@ -129,13 +207,7 @@ class TranscriptManager:
 
         Cursor points to the end of the last complete JSONL line.
         """
-        try:
-            file_size = os.path.getsize(transcript_path)
-        except OSError as e:
-            raise TranscriptManagerError(f"Unable to stat transcript: {e}") from e
-
-        prefix_sha256 = self._hash_prefix(transcript_path)
-        tail_sha256 = self._hash_tail(transcript_path)
+        file_size, prefix_sha256, tail_sha256 = self._stat_and_hash(transcript_path)
 
         if file_size == 0:
             return TranscriptCursor(
@@ -173,14 +245,7 @@ class TranscriptManager:
         """Write a compressed transcript snapshot into a checkpoint directory."""
 
         agent = agent_hint or self.detect_agent(transcript_path)
-        last_event_id_fields: list[str] | None = None
-        profile = self._registry.get(agent) if agent else None
-        if profile is not None:
-            transcript = profile.data.get("transcript") if isinstance(profile.data, dict) else None
-            if isinstance(transcript, dict):
-                fields = transcript.get("last_event_id_fields")
-                if isinstance(fields, list) and all(isinstance(x, str) for x in fields):
-                    last_event_id_fields = [str(x) for x in fields]
+        last_event_id_fields = self._last_event_id_fields.get(agent.strip().lower()) if agent else None
 
         cursor = self.compute_cursor(transcript_path, last_event_id_fields=last_event_id_fields)
 
@@ -189,13 +254,13 @@ class TranscriptManager:
         checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            with open(transcript_path, "rb") as src, gzip.open(snapshot_path, "wb") as dst:
-                # Copy whole file as-is; cursor allows fast fork creation later.
-                while True:
-                    chunk = src.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    dst.write(chunk)
+            # Copy whole file as-is; cursor allows fast fork creation later.
+            # Level 1: JSONL still compresses well and this runs on the hook path;
+            # the buffered writer batches gzip's many small writes to the file.
+            with open(transcript_path, "rb") as src:
+                out = io.BufferedWriter(io.FileIO(snapshot_path, "wb"), buffer_size=1024 * 1024)
+                with out, gzip.GzipFile(fileobj=out, mode="wb", compresslevel=1) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
         except OSError as e:
             raise TranscriptManagerError(f"Failed to snapshot transcript: {e}") from e
 
@@ -206,19 +271,23 @@ class TranscriptManager:
             cursor=cursor,
         )
 
-    def find_boundary_by_user_prompts(self, transcript_path: Path, n: int) -> BoundaryResult:
+    def find_boundary_by_user_prompts(
+        self, transcript_path: Path, n: int, *, file_size: int | None = None
+    ) -> BoundaryResult:
         """Find a rewind boundary by counting the last N user prompts.
 
         Returns the byte offset of the start of the Nth-most-recent user message line,
-        plus the extracted prompt texts (chronological order).
+        plus the extracted prompt texts (chronological order). Callers that have
+        just stat'ed the transcript can pass `file_size` to skip another stat.
         """
         if n <= 0:
             raise ValueError("n must be >= 1")
 
-        try:
-            file_size = os.path.getsize(transcript_path)
-        except OSError as e:
-            raise TranscriptManagerError(f"Unable to stat transcript: {e}") from e
+        if file_size is None:
+            try:
+                file_size = os.path.getsize(transcript_path)
+            except OSError as e:
+                raise TranscriptManagerError(f"Unable to stat transcript: {e}") from e
 
         if file_size == 0:
             raise TranscriptManagerError("Transcript is empty")
@@ -226,11 +295,6 @@ class TranscriptManager:
         prompts_newest_first: list[str] = []
         boundary_offset: int | None = None
 
-        chunk_size = 128 * 1024
-        end_offset = file_size
-        buf = b""
-        buf_start_offset = end_offset
-
         def process_line(line_bytes: bytes, line_start: int) -> None:
             nonlocal boundary_offset
 
@@ -255,28 +319,32 @@ class TranscriptManager:
 
         try:
             with open(transcript_path, "rb") as f:
-                while end_offset > 0 and boundary_offset is None:
-                    start_offset = max(0, end_offset - chunk_size)
-                    read_size = end_offset - start_offset
-                    f.seek(start_offset)
-                    data = f.read(read_size)
-
-                    buf = data + buf
-                    buf_start_offset = start_offset
-                    end_offset = start_offset
-
+                # Scan backwards in fixed-size windows; a line cut by a window
+                # start is carried over and completed by the next (earlier) read.
+                pos = min(file_size, os.fstat(f.fileno()).st_size)
+                carry = b""
+                while boundary_offset is None and pos > 0:
+                    read_size = min(_SCAN_WINDOW_BYTES, pos)
+                    pos -= read_size
+                    chunk = _pread(f, read_size, pos)
+                    if len(chunk) != read_size:
+                        raise TranscriptManagerError("Transcript was truncated while scanning it")
+                    buf = bytearray(chunk)
+                    buf += carry
+                    end = len(buf)
                     while boundary_offset is None:
-                        idx = buf.rfind(b"\n")
+                        idx = buf.rfind(b"\n", 0, end)
+                        if idx == -1 and pos > 0:
+                            break  # The line starts in an earlier window
+                        start = idx + 1
+                        # Only lines mentioning both tokens can be user messages;
+                        # the rest skip the copy and json.loads.
+                        if buf.find(b'"user"', start, end) != -1 and buf.find(b'"role"', start, end) != -1:
+                            process_line(bytes(buf[start:end]), pos + start)
                         if idx == -1:
                             break
-
-                        line = buf[idx + 1 :]
-                        line_start = buf_start_offset + idx + 1
-                        buf = buf[:idx]
-                        process_line(line, line_start)
-
-                if boundary_offset is None and buf:
-                    process_line(buf, buf_start_offset)
+                        end = idx
+                    carry = bytes(buf[:end])
         except OSError as e:
             raise TranscriptManagerError(f"Unable to read transcript: {e}") from e
 
@@ -322,9 +390,7 @@ class TranscriptManager:
 
         try:
             if current_transcript_path.exists():
-                import shutil
-
-                shutil.copy2(current_transcript_path, backup_path)
+                clone_file(current_transcript_path, backup_path)
 
             tmp_path = current_transcript_path.with_suffix(current_transcript_path.suffix + ".tmp")
             self._copy_prefix(current_transcript_path, tmp_path, boundary_offset)
@@ -356,13 +422,26 @@ class TranscriptManager:
                 return "\n".join(parts).strip()
 
         try:
-            return json.dumps(fallback, ensure_ascii=False)
+            return _dumps_unicode(fallback)
         except Exception:
             return ""
 
+    def matches_cursor(self, transcript_path: Path, cursor: TranscriptCursor) -> bool:
+        """Check that the transcript still ends exactly at `cursor`, unchanged.
+
+        Compares the size and the prefix/tail hashes; no full read.
+        """
+        try:
+            if os.path.getsize(transcript_path) != cursor.byte_offset_end:
+                return False
+            _, prefix_sha256, tail_sha256 = self._stat_and_hash(transcript_path)
+            return prefix_sha256 == cursor.prefix_sha256 and tail_sha256 == cursor.tail_sha256
+        except (OSError, TranscriptManagerError):
+            return False
+
     def prefix_matches(self, transcript_path: Path, expected_prefix_sha256: str) -> bool:
         try:
-            return self._hash_prefix(transcript_path) == expected_prefix_sha256
+            return self._stat_and_hash(transcript_path)[1] == expected_prefix_sha256
         except TranscriptManagerError:
             return False
 
@@ -409,24 +488,54 @@ class TranscriptManager:
     # Internal helpers
     # -----------------
 
-    def _hash_prefix(self, transcript_path: Path) -> str:
-        try:
-            with open(transcript_path, "rb") as f:
-                data = f.read(self.PREFIX_HASH_BYTES)
-            return hashlib.sha256(data).hexdigest()
-        except OSError as e:
-            raise TranscriptManagerError(f"Failed to hash prefix: {e}") from e
+    def _stat_and_hash(self, transcript_path: Path) -> tuple[int, str, str]:
+        """Return (size, prefix_sha256, tail_sha256) for a transcript.
 
-    def _hash_tail(self, transcript_path: Path) -> str:
+        Hashes are cached per (path, inode, size, mtime_ns), so an unchanged
+        transcript is only stat'ed.
+        """
+        path = os.fspath(transcript_path)
         try:
-            size = os.path.getsize(transcript_path)
-            start = max(0, size - self.TAIL_HASH_BYTES)
-            with open(transcript_path, "rb") as f:
-                f.seek(start)
-                data = f.read(self.TAIL_HASH_BYTES)
-            return hashlib.sha256(data).hexdigest()
+            st = os.stat(path)
+            key = (path, st.st_ino, st.st_size, st.st_mtime_ns)
+            cached = self._hash_cache.get(key)
+            if cached is not None:
+                self._hash_cache.move_to_end(key)
+                return st.st_size, cached[0], cached[1]
+
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                size = st.st_size
+                hashes = self._hash_prefix_and_tail(f, size)
         except OSError as e:
-            raise TranscriptManagerError(f"Failed to hash tail: {e}") from e
+            raise TranscriptManagerError(f"Failed to hash transcript: {e}") from e
+
+        self._hash_cache[(path, st.st_ino, size, st.st_mtime_ns)] = hashes
+        if len(self._hash_cache) > self.HASH_CACHE_SIZE:
+            self._hash_cache.popitem(last=False)
+        return size, hashes[0], hashes[1]
+
+    def _hash_prefix_and_tail(self, f, size: int) -> tuple[str, str]:
+        """SHA-256 of the first PREFIX_HASH_BYTES and last TAIL_HASH_BYTES of a file.
+
+        A file of up to PREFIX_HASH_BYTES + TAIL_HASH_BYTES is read once and
+        both ranges are hashed from that buffer; up to PREFIX_HASH_BYTES they
+        are the whole file, hashed once. This reads rather than maps: hooks
+        run while other processes may truncate the transcript, and touching
+        mapped pages past the new end raises SIGBUS where a read comes back
+        short.
+        """
+        tail_start = max(0, size - self.TAIL_HASH_BYTES)
+        if size <= self.PREFIX_HASH_BYTES + self.TAIL_HASH_BYTES:
+            data = memoryview(_pread(f, size, 0))
+            prefix_sha256 = hashlib.sha256(data[: self.PREFIX_HASH_BYTES]).hexdigest()
+            if size <= self.PREFIX_HASH_BYTES:
+                return prefix_sha256, prefix_sha256
+            return prefix_sha256, hashlib.sha256(data[tail_start:]).hexdigest()
+        return (
+            hashlib.sha256(_pread(f, self.PREFIX_HASH_BYTES, 0)).hexdigest(),
+            hashlib.sha256(_pread(f, self.TAIL_HASH_BYTES, tail_start)).hexdigest(),
+        )
 
     @staticmethod
     def _find_last_complete_line_end(f, file_size: int) -> int:
@@ -435,9 +544,7 @@ class TranscriptManager:
             return 0
 
         # If file already ends with newline, we're done.
-        f.seek(file_size - 1)
-        last = f.read(1)
-        if last == b"\n":
+        if _pread(f, 1, file_size - 1) == b"\n":
             return file_size
 
         # Otherwise scan backwards in chunks to find the final newline.
@@ -446,8 +553,7 @@ class TranscriptManager:
         while pos > 0:
             read_size = min(chunk_size, pos)
             pos -= read_size
-            f.seek(pos)
-            chunk = f.read(read_size)
+            chunk = _pread(f, read_size, pos)
             idx = chunk.rfind(b"\n")
             if idx != -1:
                 return pos + idx + 1
@@ -464,8 +570,7 @@ class TranscriptManager:
         # Note: byte_offset_end may point to a newline boundary; in that case,
         # parse the preceding line.
         start = max(0, byte_offset_end - 64 * 1024)
-        f.seek(start)
-        buf = f.read(byte_offset_end - start)
+        buf = _pread(f, byte_offset_end - start, start)
 
         # Drop trailing newline(s) so we capture the last non-empty line.
         buf = buf.rstrip(b"\n\r")
@@ -495,6 +600,9 @@ class TranscriptManager:
     def _copy_prefix(src_path: Path, dst_path: Path, byte_count: int) -> None:
         try:
             with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+                # Kernel-side copy (copy_file_range/sendfile) where supported.
+                if byte_count <= 0 or kernel_copy(src.fileno(), dst.fileno(), byte_count):
+                    return
                 remaining = byte_count
                 while remaining > 0:
                     chunk = src.read(min(1024 * 1024, remaining))
@@ -535,45 +643,52 @@ class TranscriptManager:
 
     @staticmethod
     def _prefix_first_title_field(path: Path, prefix: str, max_lines: int = 50) -> None:
-        """Prefix the first JSON object containing a 'title' field."""
-        tmp_path = path.with_suffix(path.suffix + ".tmp")
-        replaced = False
-
-        with open(path, "rb") as src, open(tmp_path, "wb") as dst:
-            for i in range(max_lines):
-                line = src.readline()
-                if not line:
-                    break
-                if replaced:
-                    dst.write(line)
-                    continue
+        """Prefix the first JSON object containing a 'title' field.
 
-                stripped = line.strip()
-                if not stripped:
-                    dst.write(line)
-                    continue
+        Only the first `max_lines` lines are searched, and only lines holding
+        the raw `"title"` key are parsed. The file is left untouched when no
+        line matches.
 
-                try:
-                    obj = json.loads(stripped)
-                except json.JSONDecodeError:
-                    dst.write(line)
-                    continue
+        `path` is memory-mapped, so it must not be truncated meanwhile (pages
+        past a new end raise SIGBUS). Callers pass the fork they just wrote,
+        which no other process knows about yet.
+        """
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+        with open(path, "rb") as src:
+            if os.fstat(src.fileno()).st_size == 0:
+                return
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                head_end = 0
+                for _ in range(max_lines):
+                    nl = mm.find(b"\n", head_end)
+                    if nl == -1:
+                        head_end = len(mm)
+                        break
+                    head_end = nl + 1
 
-                if isinstance(obj, dict) and isinstance(obj.get("title"), str):
-                    title = obj["title"]
-                    if not title.startswith(prefix):
-                        obj["title"] = prefix + title
-                    new_line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
-                    dst.write(new_line)
-                    replaced = True
-                else:
-                    dst.write(line)
-
-            # Copy remainder
-            while True:
-                chunk = src.read(1024 * 1024)
-                if not chunk:
-                    break
-                dst.write(chunk)
+                pos = 0
+                while True:
+                    idx = mm.find(b'"title"', pos, head_end)
+                    if idx == -1:
+                        return
+                    line_start = mm.rfind(b"\n", 0, idx) + 1
+                    nl = mm.find(b"\n", idx, head_end)
+                    line_end = head_end if nl == -1 else nl + 1
+                    try:
+                        obj = json.loads(view[line_start:line_end].tobytes())
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict) and isinstance(obj.get("title"), str):
+                        break
+                    pos = line_end
+
+                title = obj["title"]
+                if not title.startswith(prefix):
+                    obj["title"] = prefix + title
+                with open(tmp_path, "wb") as dst:
+                    dst.write(view[:line_start])
+                    dst.write((_dumps_unicode(obj) + "\n").encode("utf-8"))
+                    dst.write(view[line_end:])
 
         os.replace(tmp_path, path)
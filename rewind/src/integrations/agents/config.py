@@ -4,35 +4,41 @@ from pathlib import Path
 from typing import Any
 
 from ...utils.env import get_global_rewind_dir
-from ...utils.fs import safe_json_load
+from ...utils.fs import cached_json_load
 from .types import AgentOverrides
 
 
 def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    # Iterative: each nested dict on the merge path is shallow-copied exactly once.
     result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
-        else:
-            result[key] = value
+    if not override:
+        return result
+    stack = [(result, override)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = current.copy()
+                dst[key] = merged
+                stack.append((merged, value))
+            else:
+                dst[key] = value
     return result
 
 
 def load_merged_config(project_root: Path | None) -> dict[str, Any]:
     merged: dict[str, Any] = {}
 
-    global_path = get_global_rewind_dir() / "config.json"
-    if global_path.exists():
-        global_data = safe_json_load(global_path, {})
-        if isinstance(global_data, dict):
-            merged = _deep_merge(merged, global_data)
+    # Parsed files are cached by mtime; treat them as read-only.
+    global_data = cached_json_load(get_global_rewind_dir() / "config.json", {})
+    if isinstance(global_data, dict):
+        merged = _deep_merge(merged, global_data)
 
     if project_root:
-        project_path = project_root / ".agent" / "rewind" / "config.json"
-        if project_path.exists():
-            project_data = safe_json_load(project_path, {})
-            if isinstance(project_data, dict):
-                merged = _deep_merge(merged, project_data)
+        project_data = cached_json_load(project_root / ".agent" / "rewind" / "config.json", {})
+        if isinstance(project_data, dict):
+            merged = _deep_merge(merged, project_data)
 
     return merged
 
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Iterable
 
 
-def _iter_path_parts(path: str) -> list[str]:
+@lru_cache(maxsize=256)
+def compile_path(path: str) -> tuple[str, ...]:
+    """Parse a `$.a.b.c` path into its components (memoized)."""
     s = path.strip()
     if not s:
-        return []
+        return ()
     if s.startswith("$."):
         s = s[2:]
-    return [p for p in s.split(".") if p]
+    return tuple(p for p in s.split(".") if p)
+
+
+def get_compiled(data: Any, parts: tuple[str, ...]) -> Any:
+    """Like `get_path`, but takes components from `compile_path`."""
+    cur: Any = data
+    for part in parts:
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
 
 
 def get_path(data: Any, path: str) -> Any:
@@ -19,19 +32,12 @@ def get_path(data: Any, path: str) -> Any:
     Returns None if any component is missing.
     """
 
-    cur: Any = data
-    for part in _iter_path_parts(path):
-        if not isinstance(cur, dict):
-            return None
-        if part not in cur:
-            return None
-        cur = cur[part]
-    return cur
+    return get_compiled(data, compile_path(path))
 
 
 def first_present(data: Any, paths: Iterable[str]) -> Any:
     for p in paths:
-        val = get_path(data, p)
+        val = get_compiled(data, compile_path(p))
         if val is not None:
             return val
     return None
@@ -9,6 +9,7 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from ...utils.fs import safe_json_load
 from .io import log_debug
 from .policy import HookOutcome, session_start_description, should_create_session_start_baseline
 from .types import (
@@ -237,15 +238,10 @@ class HookHandler:
     
     def _load_state(self) -> None:
         """Load state from file."""
-        import json
         state_path = self.controller.get_rewind_dir() / "hook-state.json"
-        if state_path.exists():
-            try:
-                with open(state_path) as f:
-                    data = json.load(f)
-                self._last_checkpoint_time = data.get("last_checkpoint_time")
-            except (OSError, json.JSONDecodeError):
-                pass
+        data = safe_json_load(state_path, {})
+        if isinstance(data, dict):
+            self._last_checkpoint_time = data.get("last_checkpoint_time")
     
     def _save_state(self) -> None:
         """Save state to file."""
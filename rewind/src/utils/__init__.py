@@ -1,12 +1,26 @@
 """Utility modules for Rewind."""
 
-from .fs import atomic_write, ensure_dir, file_exists, safe_json_load, safe_stat
+from .fs import (
+    atomic_write,
+    cached_json_load,
+    clone_file,
+    copy_file,
+    ensure_dir,
+    file_exists,
+    kernel_copy,
+    safe_json_load,
+    safe_stat,
+)
 from .env import get_home_dir, get_global_rewind_dir, get_global_storage_dir, is_debug_mode
 
 __all__ = [
     "atomic_write",
+    "cached_json_load",
+    "clone_file",
+    "copy_file",
     "ensure_dir",
     "file_exists",
+    "kernel_copy",
     "safe_json_load",
     "safe_stat",
     "get_home_dir",
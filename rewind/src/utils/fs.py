@@ -5,16 +5,33 @@ Provides atomic writes, directory creation, and safe file operations.
 
 from __future__ import annotations
 
+import errno
 import json
 import os
+import shutil
+import sys
 import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+# Linux ioctl that makes dst share src's extents (copy-on-write, btrfs/xfs/...)
+_FICLONE: int | None = (
+    getattr(fcntl, "FICLONE", 0x40049409) if fcntl is not None and sys.platform.startswith("linux") else None
+)
 
 
 def atomic_write(file_path: Path | str, content: str | bytes, mode: str = "w") -> None:
     """Write content atomically using tempfile + rename pattern.
     
+    No fsync is issued: the rename guarantees readers never see a partial
+    file, not that the data survives a power loss.
+    
     Args:
         file_path: Target file path
         content: Content to write
@@ -43,6 +60,89 @@ def atomic_write(file_path: Path | str, content: str | bytes, mode: str = "w") -
         raise
 
 
+def clone_file(src: Path | str, dst: Path | str) -> None:
+    """Copy a file with its metadata, as a copy-on-write clone when possible.
+    
+    The clone is O(1) on filesystems with reflink support and, unlike a
+    hardlink, is unaffected by later writes to or truncation of `src`.
+    Elsewhere this falls back to a regular `shutil.copy2`.
+    
+    Args:
+        src: File to copy
+        dst: Destination path (overwritten)
+    """
+    if _FICLONE is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # No reflink support here; copy2 rewrites dst
+    shutil.copy2(src, dst)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+# Kernel-side copies, best first: copy_file_range can reflink on btrfs/xfs.
+_KERNEL_COPIES: tuple[Callable[[int, int, int, int], int], ...] = tuple(
+    copy for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+    if hasattr(os, name)
+)
+_KERNEL_COPY_UNSUPPORTED = frozenset(
+    getattr(errno, code) for code in ("ENOSYS", "EXDEV", "EINVAL", "ENOTSUP", "EOPNOTSUPP", "ENOTSOCK")
+    if hasattr(errno, code)
+)
+
+
+def copy_file(src: Path | str, dst: Path | str) -> None:
+    """Like shutil.copy2, but the data is copied in the kernel where possible.
+    
+    Args:
+        src: File to copy
+        dst: Destination path (overwritten)
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if not kernel_copy(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size):
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+
+def kernel_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy `size` bytes between file descriptors without userspace buffers.
+    
+    Bytes [0, size) of src land at the same offsets of `dst_fd`, which
+    should be a freshly opened, empty file.
+    
+    Args:
+        src_fd: Descriptor to copy from
+        dst_fd: Descriptor to copy to
+        size: Number of bytes to copy
+        
+    Returns:
+        True once copied; False if no kernel copy works here (nothing written)
+    """
+    for copy in _KERNEL_COPIES:
+        offset = 0
+        try:
+            while offset < size:
+                copied = copy(src_fd, dst_fd, offset, size - offset)
+                if not copied:
+                    break
+                offset += copied
+            return True
+        except OSError as e:
+            if offset or e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                raise
+    return False
+
+
 def ensure_dir(dir_path: Path | str) -> Path:
     """Ensure directory exists, creating it if necessary.
     
@@ -80,10 +180,52 @@ def safe_json_load(file_path: Path | str, default: Any = None) -> Any:
         Parsed JSON or default value
     """
     try:
-        with open(file_path) as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError):
+        # Bytes straight to the parser: no text-mode decode layer in between.
+        with open(file_path, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):  # ValueError: JSONDecodeError / bad UTF-8
+        return default if default is not None else {}
+
+
+# Parsed JSON keyed by path, invalidated by (inode, mtime_ns, size).
+_JSON_CACHE: dict[str, tuple[tuple[int, int, int], Any]] = {}
+
+# Cached in place of unreadable or invalid JSON; each caller gets its own default.
+_INVALID_JSON: Any = object()
+
+
+def cached_json_load(file_path: Path | str, default: Any = None) -> Any:
+    """Like safe_json_load, but reuse the parsed value while the file is unchanged.
+    
+    The file is stat'ed on every call and re-parsed only when its inode,
+    mtime or size changes. The returned value is shared between calls, so callers
+    must treat it as read-only.
+    
+    Args:
+        file_path: Path to JSON file
+        default: Default value if file doesn't exist or is invalid
+        
+    Returns:
+        Parsed JSON or default value
+    """
+    key = os.fspath(file_path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        _JSON_CACHE.pop(key, None)
+        return default if default is not None else {}
+    
+    signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _JSON_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        data = cached[1]
+    else:
+        data = safe_json_load(key, _INVALID_JSON)
+        _JSON_CACHE[key] = (signature, data)
+    
+    if data is _INVALID_JSON:
         return default if default is not None else {}
+    return data
 
 
 def safe_stat(file_path: Path | str) -> os.stat_result | None:
@@ -22,4 +22,4 @@ def read_text_resource(*parts: str, encoding: str = "utf-8") -> str:
 
 
 def read_json_resource(*parts: str) -> Any:
-    return json.loads(read_text_resource(*parts))
+    return json.loads(resource_dir(*parts).read_bytes())
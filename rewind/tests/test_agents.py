@@ -3,7 +3,9 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from src.integrations.agents.config import load_merged_config
 from src.integrations.agents.envfile import write_env_exports
+from src.integrations.agents.jsonpath import compile_path, first_present, get_path
 from src.integrations.agents.normalize import resolve_context_and_envelope
 
 
@@ -88,6 +90,45 @@ def test_config_override_transcript_path(tmp_path: Path):
     assert ctx.transcript_path == "/forced.jsonl"
 
 
+def test_merged_config_deep_merges_project_over_global(tmp_path: Path):
+    global_dir = tmp_path / ".rewind"
+    global_dir.mkdir(parents=True, exist_ok=True)
+    global_cfg = {"agent": {"kind": "claude", "paths": {"a": 1, "b": 2}}, "keep": True}
+    (global_dir / "config.json").write_text(json.dumps(global_cfg))
+
+    project = tmp_path / "repo"
+    project_dir = project / ".agent" / "rewind"
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "config.json").write_text(json.dumps({"agent": {"paths": {"b": 3, "c": 4}}}))
+
+    merged = load_merged_config(project)
+    assert merged == {"agent": {"kind": "claude", "paths": {"a": 1, "b": 3, "c": 4}}, "keep": True}
+
+
+def test_merged_config_reloads_after_file_changes(tmp_path: Path):
+    cfg_path = tmp_path / ".rewind" / "config.json"
+    cfg_path.parent.mkdir(parents=True, exist_ok=True)
+    cfg_path.write_text(json.dumps({"agent": "droid"}))
+    assert load_merged_config(None) == {"agent": "droid"}
+
+    cfg_path.write_text(json.dumps({"agent": "claude"}))
+    assert load_merged_config(None) == {"agent": "claude"}
+
+    cfg_path.unlink()
+    assert load_merged_config(None) == {}
+
+
+def test_jsonpath_compiled_lookup():
+    assert compile_path(" $.a.b ") == ("a", "b")
+    assert compile_path("") == ()
+
+    data = {"a": {"b": 1, "n": None}, "s": "x"}
+    assert get_path(data, "$.a.b") == 1
+    assert get_path(data, "$.a.missing") is None
+    assert get_path(data, "$.s.deeper") is None
+    assert first_present(data, ["$.a.n", "$.s"]) == "x"
+
+
 def test_write_env_exports_appends(tmp_path: Path):
     env_file = tmp_path / "env"
     env_file.write_text('export REWIND_AGENT_KIND="old"\n')
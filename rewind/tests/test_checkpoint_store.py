@@ -1,6 +1,8 @@
 """Tests for checkpoint store."""
 
 import json
+import os
+import shutil
 import tempfile
 from pathlib import Path
 
@@ -86,6 +88,15 @@ class TestCheckpointStore:
         assert restore_result.success
         assert (temp_project / "app.py").read_text() == "print('hello')"
     
+    def test_restore_keeps_subsecond_mtime(self, store, temp_project):
+        """Test that restored files keep the fractional part of their mtime."""
+        os.utime(temp_project / "app.py", (1704164645.678901, 1704164645.678901))
+        result = store.create(description="Before change")
+        (temp_project / "app.py").write_text("print('modified')")
+        
+        assert store.restore(result.name, backup=False).success
+        assert (temp_project / "app.py").stat().st_mtime == pytest.approx(1704164645.678901, abs=1e-5)
+    
     def test_delete_checkpoint(self, store):
         """Test deleting a checkpoint."""
         result = store.create(description="To delete")
@@ -112,6 +123,66 @@ class TestCheckpointStore:
         assert deleted == 3
         assert len(store.list()) == 2
     
+    def test_list_with_limit_returns_newest(self, store):
+        """Test that a limited listing returns only the newest checkpoints."""
+        for i in range(4):
+            store.create(description=f"Checkpoint {i}")
+        
+        newest = store.list(limit=2)
+        
+        assert [cp.name for cp in newest] == [cp.name for cp in store.list()[:2]]
+        assert newest[0].description == "Checkpoint 3"
+        assert store.list(limit=0) == []
+    
+    def test_list_tracks_index_changes(self, store):
+        """Test that full listings stay correct as the metadata index changes."""
+        first = store.create(description="First").name
+        second = store.create(description="Second").name
+        assert [cp.name for cp in store.list()] == [second, first]
+        assert (store.storage_dir / store.INDEX_NAME).exists()
+        
+        store.update_metadata(first, description="Renamed")
+        assert store.list()[1].description == "Renamed"
+        
+        # Removed behind the store's back: the stale index is rebuilt
+        shutil.rmtree(store.storage_dir / second)
+        assert [cp.name for cp in store.list()] == [first]
+        
+        store.delete(first)
+        assert store.list() == []
+    
+    def test_same_millisecond_names_stay_unique(self, store, monkeypatch):
+        """Test that checkpoints created within one millisecond don't collide."""
+        from datetime import datetime
+        import src.core.checkpoint_store as checkpoint_store
+        
+        frozen = datetime(2025, 1, 2, 3, 4, 5, 6000)
+        
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen
+        
+        monkeypatch.setattr(checkpoint_store, "datetime", FrozenDatetime)
+        names = [store.create(description=f"Checkpoint {i}").name for i in range(3)]
+        
+        assert names == ["20250102_030405_006", "20250102_030405_007", "20250102_030405_008"]
+        assert [cp.description for cp in store.list()] == ["Checkpoint 2", "Checkpoint 1", "Checkpoint 0"]
+    
+    def test_restore_zstd_snapshot_without_zstd(self, store, monkeypatch):
+        """Test that a zstd snapshot fails with a clear error when zstd is unavailable."""
+        import src.core.checkpoint_store as checkpoint_store
+        
+        name = store.create(description="Checkpoint").name
+        cp_dir = store.storage_dir / name
+        (cp_dir / store.ARCHIVE_NAME).rename(cp_dir / store.ZSTD_ARCHIVE_NAME)
+        monkeypatch.setattr(checkpoint_store, "_HAS_ZSTD", False)
+        
+        result = store.restore(name, backup=False)
+        
+        assert not result.success
+        assert "Python 3.14" in result.error
+    
     def test_ignores_node_modules(self, store, temp_project):
         """Test that node_modules is ignored."""
         result = store.create(description="Test")
@@ -159,3 +230,13 @@ class TestIgnoreConfig:
         
         assert config.should_ignore(".env")
         assert not config.should_ignore(".env.example")
+    
+    def test_additional_and_path_patterns(self):
+        """Test additional ignores, including patterns containing a slash."""
+        config = IgnoreConfig(additional_ignores=["*.gen.ts", "docs/*.html"])
+        
+        assert config.should_ignore("src/api.gen.ts")
+        assert config.should_ignore("docs/index.html")
+        assert config.should_ignore("pkg/docs/index.html")
+        assert not config.should_ignore("src/api.ts")
+        assert not config.should_ignore("index.html")
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 from src.config.loader import ConfigLoader
+from src.config.types import IgnoreConfig, RewindConfig, TierConfig
 from src.utils.resources import read_json_resource
 
 
@@ -58,3 +59,32 @@ def test_load_tier_config_uses_global_config(tmp_path, monkeypatch):
     tier = loader.load_tier_config(None)
     assert tier.tier == "aggressive"
     assert tier.anti_spam.min_interval_seconds == 3
+
+
+def test_reload_picks_up_changed_global_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _write_global_config(tmp_path, {"preset": "balanced"})
+
+    loader = ConfigLoader(project_root=tmp_path / "proj")
+    assert loader.config.tier.tier == "balanced"
+
+    _write_global_config(tmp_path, {"preset": "aggressive", "runtime": {"antiSpam": {"minIntervalSeconds": 7}}})
+    cfg = loader.reload()
+    assert cfg.tier.tier == "aggressive"
+    assert cfg.tier.anti_spam.min_interval_seconds == 7
+
+
+def test_loaded_pattern_lists_are_not_shared_between_loaders(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _write_global_config(tmp_path, {"ignore": {"additionalIgnores": ["b"]}})
+
+    ConfigLoader(project_root=tmp_path / "proj").config.ignore.additional_ignores.append("X")
+    assert ConfigLoader(project_root=tmp_path / "proj").config.ignore.additional_ignores == ["b"]
+
+
+def test_rewind_config_accepts_parsed_or_raw_settings():
+    parsed = RewindConfig(tier=TierConfig(tier="minimal"), ignore=IgnoreConfig(patterns=["x"]))
+    raw = RewindConfig(tier_data={"tier": "minimal"}, ignore_data={"ignorePatterns": ["x"], "forceInclude": [".env.example"]})
+
+    assert parsed.tier.tier == "minimal"
+    assert raw == parsed
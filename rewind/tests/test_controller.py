@@ -81,6 +81,59 @@ class TestRewindController:
         assert meta.get("hasTranscript") is True
         assert meta.get("transcript", {}).get("snapshot") == "transcript.jsonl.gz"
 
+    def test_create_checkpoint_reuses_unchanged_transcript_snapshot(self, controller, tmp_path):
+        """An unchanged transcript links the previous snapshot instead of re-compressing it."""
+        controller.init()
+
+        transcript = tmp_path / "session.jsonl"
+        transcript.write_text(json.dumps({"id": "m1", "role": "user", "content": "hi"}) + "\n", encoding="utf-8")
+        controller.save_session_info(transcript_path=str(transcript), agent="droid")
+
+        first = controller.create_checkpoint(description="First")
+        second = controller.create_checkpoint(description="Second")
+        assert second["hasTranscript"] is True
+
+        cp_dir = controller.get_checkpoints_dir()
+        meta = json.loads((cp_dir / second["name"] / "metadata.json").read_text(encoding="utf-8"))
+        assert meta["transcript"]["reuses"] == first["name"]
+        assert (cp_dir / second["name"] / "transcript.jsonl.gz").read_bytes() == (
+            cp_dir / first["name"] / "transcript.jsonl.gz"
+        ).read_bytes()
+
+        with open(transcript, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": "m2", "role": "assistant", "content": "yo"}) + "\n")
+        third = controller.create_checkpoint(description="Third")
+        meta = json.loads((cp_dir / third["name"] / "metadata.json").read_text(encoding="utf-8"))
+        assert "reuses" not in meta["transcript"]
+        assert meta["transcript"]["cursor"]["byte_offset_end"] == transcript.stat().st_size
+
+    def test_save_session_info_journals_timestamp_only_updates(self, controller):
+        """Repeat saves for the same session append to the journal instead of rewriting."""
+        controller.init()
+        session_file = controller.get_session_file()
+        updates_file = session_file.with_name("session-updates.jsonl")
+
+        controller.save_session_info(transcript_path="/tmp/t.jsonl", session_id="s1", agent="droid")
+        original = session_file.read_bytes()
+        first_ns = controller.load_session_info()["updated_at_ns"]
+
+        controller.save_session_info(transcript_path="/tmp/t.jsonl", session_id="s1", agent="droid")
+        assert session_file.read_bytes() == original
+        assert len(updates_file.read_text(encoding="utf-8").splitlines()) == 1
+        info = controller.load_session_info()
+        assert info["session_id"] == "s1"
+        assert info["updated_at_ns"] >= first_ns
+
+        # A full journal is folded back into session.json
+        updates_file.write_bytes(updates_file.read_bytes() * 4096)
+        controller.save_session_info(transcript_path="/tmp/t.jsonl", session_id="s1", agent="droid")
+        assert not updates_file.exists()
+        assert json.loads(session_file.read_bytes())["updated_at_ns"] >= info["updated_at_ns"]
+
+        controller.save_session_info(transcript_path="/tmp/t.jsonl", session_id="s2", agent="droid")
+        assert not updates_file.exists()
+        assert controller.load_session_info()["session_id"] == "s2"
+
     def test_restore_context_creates_fork_session(self, controller, tmp_path):
         """Restoring context creates a forked session JSONL (does not overwrite original)."""
         controller.init()
@@ -127,6 +180,20 @@ class TestRewindController:
         
         assert len(checkpoints) == 2
     
+    def test_list_checkpoints_cache_tracks_changes(self, controller, temp_project):
+        """Cached listings are dropped when the controller changes the store."""
+        controller.init()
+        controller.create_checkpoint(description="First")
+        assert [cp.description for cp in controller.list_checkpoints()] == ["First"]
+        
+        (temp_project / "app.py").write_text("print('changed')")
+        second = controller.create_checkpoint(description="Second")
+        assert [cp.description for cp in controller.list_checkpoints()] == ["Second", "First"]
+        assert [cp.name for cp in controller.head_checkpoints(1)] == [second["name"]]
+        
+        controller.undo()
+        assert [cp.description for cp in controller.list_checkpoints()] == ["First"]
+    
     def test_restore_checkpoint(self, controller, temp_project):
         """Test restoring a checkpoint."""
         controller.init()
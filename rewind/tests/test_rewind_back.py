@@ -117,6 +117,43 @@ def test_select_checkpoint_for_boundary():
     assert chosen.name == "newest"
 
 
+def test_select_checkpoint_prefers_newest_not_largest_offset():
+    transcript_path = "/tmp/t.jsonl"
+
+    def cp(name: str, offset: int) -> CheckpointMetadata:
+        return CheckpointMetadata(
+            name=name,
+            timestamp="t",
+            description="",
+            file_count=0,
+            total_size=0,
+            has_transcript=True,
+            transcript={
+                "original_path": transcript_path,
+                "cursor": {"byte_offset_end": offset},
+            },
+        )
+
+    # Newest first; the transcript was rewritten shorter between checkpoints.
+    checkpoints = [cp("newest", 40), cp("middle", 120), cp("oldest", 10)]
+
+    def select(boundary_offset: int) -> str | None:
+        chosen = RewindController._select_checkpoint_for_boundary(
+            checkpoints,
+            transcript_path=transcript_path,
+            boundary_offset=boundary_offset,
+        )
+        return chosen.name if chosen else None
+
+    assert select(200) == "newest"
+    assert select(40) == "newest"
+    assert select(39) == "oldest"
+    assert select(5) is None
+    assert RewindController._select_checkpoint_for_boundary(
+        checkpoints, transcript_path="/tmp/other.jsonl", boundary_offset=200
+    ) is None
+
+
 def test_find_boundary_raises_when_not_enough(tmp_path: Path):
     tp = tmp_path / "t.jsonl"
     tp.write_text("{}\n", encoding="utf-8")
@@ -78,3 +78,16 @@ def test_create_fork_session_fast_path_truncates(tmp_path: Path, transcript_file
     assert fork_text.count("\n") == 1
     assert "\"title\": \"[Fork] My Session\"" in fork_text
     assert "m2" not in fork_text
+
+
+def test_cursor_hashes_follow_transcript_changes(transcript_file: Path):
+    mgr = TranscriptManager()
+    before = mgr.compute_cursor(transcript_file)
+    assert mgr.compute_cursor(transcript_file) == before
+
+    with open(transcript_file, "a", encoding="utf-8") as f:
+        f.write("\n")
+    after = mgr.compute_cursor(transcript_file)
+
+    assert after.tail_sha256 != before.tail_sha256
+    assert after.byte_offset_end == transcript_file.stat().st_size